@@ -0,0 +1,199 @@
+"""Bounded columnar analysis history with an append-only Parquet store.
+
+Every analysis is written into fixed-size NumPy column arrays used as a ring
+buffer, so memory stays bounded however long a session runs. Rows are
+spilled in batches to immutable Parquet segments under ``store_dir``, which
+makes the history survive restarts. Small segments are compacted size-tiered:
+once ``merge_segments`` trailing segments fall in the same size tier they are
+rewritten as one, up to ``segment_rows`` rows, so the store holds a handful of
+segments per tier and each row is rewritten only a few times. Export streams
+segment by segment, then the rows still in memory, instead of materializing
+the whole history at once.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+HISTORY_DIR = "analysis_history"
+
+# Schema metadata key of a compacted segment, listing the segments it replaced
+MERGED_KEY = b"merged_from"
+
+# Raw features appear in FEATURES order after the timestamp
+HISTORY_SCHEMA = (
+    ('timestamp', 'datetime64[ms]'),
+    ('loan_amount', 'float64'),
+    ('loan_tenure_months', 'int16'),
+    ('ltv', 'float64'),
+    ('valuation_diff_pct', 'float64'),
+    ('num_prev_mortgages', 'int16'),
+    ('ownership_match_score', 'float64'),
+    ('ocr_confidence', 'float64'),
+    ('encumbrance_flag', 'uint8'),
+    ('credit_score', 'int16'),
+    ('income', 'float64'),
+    ('fraud_probability', 'float64'),
+    ('prediction', 'int8'),
+    ('risk_score', 'int16'),
+    ('model_version', 'object'),
+)
+
+
+class AnalysisHistory:
+    """Ring buffer of the most recent analyses backed by Parquet segments."""
+
+    def __init__(self, store_dir=HISTORY_DIR, capacity=1000, flush_rows=256, segment_rows=65536,
+                 merge_segments=8):
+        if not 1 <= flush_rows <= capacity:
+            raise ValueError("flush_rows must be between 1 and capacity")
+        if merge_segments < 2:
+            raise ValueError("merge_segments must be at least 2")
+        self.store_dir = store_dir
+        self.capacity = capacity
+        self.flush_rows = flush_rows
+        self.segment_rows = segment_rows
+        self.merge_segments = merge_segments
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in HISTORY_SCHEMA}
+        self._next = 0
+        self._unflushed = 0
+        self._readers = 0
+        self._lock = threading.Lock()
+        os.makedirs(store_dir, exist_ok=True)
+        # Row counts come from the Parquet footers; no column data is read at startup
+        self._segment_rows = {}
+        replaced = set()
+        for name in sorted(name for name in os.listdir(store_dir) if name.endswith(".parquet")):
+            metadata = pq.read_metadata(os.path.join(store_dir, name))
+            self._segment_rows[os.path.join(store_dir, name)] = metadata.num_rows
+            merged_from = (metadata.metadata or {}).get(MERGED_KEY)
+            if merged_from:
+                replaced.update(merged_from.decode().split(","))
+        # A compaction interrupted before removing its inputs leaves them beside the merged segment
+        for name in replaced:
+            path = os.path.join(store_dir, name)
+            if self._segment_rows.pop(path, None) is not None:
+                os.remove(path)
+        self._persisted_rows = sum(self._segment_rows.values())
+
+    def _segments(self):
+        return sorted(self._segment_rows)
+
+    def _tier(self, rows):
+        tier = 0
+        while rows > self.flush_rows * self.merge_segments ** tier:
+            tier += 1
+        return tier
+
+    def __len__(self):
+        return self._persisted_rows + self._unflushed
+
+    def append(self, record):
+        """Record one analysis; ``record`` maps HISTORY_SCHEMA names to values.
+
+        ``timestamp`` defaults to now and ``model_version`` is optional; every
+        other column is required.
+        """
+        with self._lock:
+            position = self._next
+            for name, _ in HISTORY_SCHEMA:
+                if name == 'timestamp':
+                    value = record.get(name) or np.datetime64(time.time_ns() // 1_000_000, 'ms')
+                elif name == 'model_version':
+                    value = record.get(name)
+                else:
+                    value = record[name]
+                self._columns[name][position] = value
+            self._next = (position + 1) % self.capacity
+            self._unflushed += 1
+            if self._unflushed >= self.flush_rows:
+                self._flush_locked()
+
+    def _last_positions(self, count):
+        return (self._next - count + np.arange(count)) % self.capacity
+
+    def _frame(self, positions):
+        return pd.DataFrame({name: column[positions] for name, column in self._columns.items()})
+
+    def _flush_locked(self):
+        if not self._unflushed:
+            return
+        table = pa.Table.from_pandas(self._frame(self._last_positions(self._unflushed)), preserve_index=False)
+        # Name sorts by time; write to a temp file and rename so readers never see a partial segment
+        name = f"history-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(self.store_dir, name)
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        self._segment_rows[path] = self._unflushed
+        self._persisted_rows += self._unflushed
+        self._unflushed = 0
+        self._compact_locked()
+
+    def _compact_locked(self):
+        # Merge the trailing segments while they share a tier; a running export
+        # holds on to the segment list, so compaction waits for the next flush
+        while not self._readers:
+            paths = self._segments()[-self.merge_segments:]
+            if len(paths) < self.merge_segments:
+                return
+            rows = [self._segment_rows[path] for path in paths]
+            if len({self._tier(count) for count in rows}) > 1 or sum(rows) > self.segment_rows:
+                return
+            tables = [pq.read_table(path) for path in paths]
+            metadata = {key: value for key, value in (tables[0].schema.metadata or {}).items() if key != MERGED_KEY}
+            metadata[MERGED_KEY] = ",".join(os.path.basename(path) for path in paths[:-1]).encode()
+            table = pa.concat_tables(table.replace_schema_metadata(metadata) for table in tables)
+            # The merged segment takes the newest input's name, so it keeps its place in time order
+            target = paths[-1]
+            pq.write_table(table, target + ".tmp")
+            os.replace(target + ".tmp", target)
+            for path in paths[:-1]:
+                os.remove(path)
+                del self._segment_rows[path]
+            self._segment_rows[target] = sum(rows)
+
+    def flush(self):
+        """Spill buffered rows to a new Parquet segment."""
+        with self._lock:
+            self._flush_locked()
+
+    def iter_frames(self):
+        """Yield the full history oldest first: each stored segment, then the unflushed rows.
+
+        Nothing is written, so exporting does not leave small segments behind.
+        """
+        with self._lock:
+            self._readers += 1
+            paths = self._segments()
+            pending = self._frame(self._last_positions(self._unflushed))
+        try:
+            for path in paths:
+                yield pq.read_table(path).to_pandas()
+            if len(pending):
+                yield pending
+        finally:
+            with self._lock:
+                self._readers -= 1
+
+    def export_csv(self, fileobj):
+        """Stream the full history as CSV into ``fileobj``; returns the row count."""
+        rows = 0
+        for frame in self.iter_frames():
+            frame.to_csv(fileobj, header=rows == 0, index=False)
+            rows += len(frame)
+        return rows
+
+    def clear(self):
+        """Drop the in-memory buffer and every stored segment."""
+        with self._lock:
+            for path in self._segments():
+                os.remove(path)
+            self._segment_rows.clear()
+            self._next = self._unflushed = 0
+            self._persisted_rows = 0
@@ -0,0 +1,434 @@
+"""Durable, checksummed audit log of every fraud decision.
+
+``AuditLog.append`` only queues a record and returns; a background writer
+thread serializes whatever has queued up, appends it to the current segment
+and makes the whole group durable with one ``fsync`` (group commit). While one
+group is being synced the next one accumulates, so the fsync rate adapts to
+load and scoring never waits on the disk. A write that keeps failing stops the
+writer, and every later ``append`` or ``flush`` raises instead of queueing.
+
+Each writer (process) has its own append-only segment files under
+``audit_log/``. A segment starts with a magic string; every record is framed
+as ``<length, crc32(length), crc32(length + payload)>`` followed by its JSON
+payload, so a damaged length is caught rather than read as a short file. A
+crash can only leave a torn record at the very end of a writer's last segment,
+which replay reports and skips; anything else that fails its checks is
+corruption and raises ``AuditLogCorrupt``.
+
+    python audit_log.py                  # replay every decision as JSON lines
+    python audit_log.py --verify         # check every checksum; exit 1 on any skipped record
+    python audit_log.py --rescore        # re-score records made by the current model
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import warnings
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+
+from fraud_scorer import FEATURES
+
+AUDIT_DIR = "audit_log"
+
+_MAGIC = b"FRAUDIT2"
+_LENGTH = struct.Struct("<I")
+_FRAME = struct.Struct("<III")  # payload length, crc32 of the length, crc32 of length + payload
+
+
+class AuditLogCorrupt(ValueError):
+    """A segment has a record whose checksum does not match."""
+
+
+def _frame(payload):
+    length = _LENGTH.pack(len(payload))
+    return _FRAME.pack(len(payload), zlib.crc32(length), zlib.crc32(payload, zlib.crc32(length))) + payload
+
+
+def decision_record(inputs, scaled, probability, verdict, model_version, source):
+    """A JSON-ready audit record for one decision (``inputs`` maps FEATURES to raw values)."""
+    now = time.time()
+    return {
+        "ts": now,
+        "time": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+        "source": source,
+        "model_version": model_version,
+        "inputs": {name: float(inputs[name]) for name in FEATURES},
+        "scaled": None if scaled is None else [float(value) for value in np.ravel(scaled)],
+        "probability": float(probability),
+        "verdict": int(verdict),
+    }
+
+
+def decision_records(X, scaled, probabilities, verdicts, model_version, source):
+    """Audit records for a scored batch (raw rows in FEATURES order)."""
+    now = time.time()
+    stamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    scaled = [None] * len(X) if scaled is None else np.asarray(scaled, dtype=np.float64).tolist()
+    return [
+        {"ts": now, "time": stamp, "source": source, "model_version": model_version,
+         "inputs": dict(zip(FEATURES, row)), "scaled": scaled_row,
+         "probability": probability, "verdict": int(verdict)}
+        for row, scaled_row, probability, verdict in zip(
+            np.asarray(X, dtype=np.float64).tolist(), scaled,
+            np.asarray(probabilities, dtype=np.float64).tolist(), np.asarray(verdicts).tolist())
+    ]
+
+
+def batch_record(X, scaled, probabilities, verdicts, model_version, source):
+    """One columnar audit record for a whole scored chunk (raw and scaled rows in FEATURES order).
+
+    Large uploads are logged as one record per chunk rather than one per row;
+    ``sha256`` digests the raw rows so the record can be matched to its input.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    now = time.time()
+    return {
+        "ts": now,
+        "time": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+        "source": source,
+        "model_version": model_version,
+        "features": list(FEATURES),
+        "sha256": hashlib.sha256(X.tobytes()).hexdigest(),
+        "rows": X.tolist(),
+        "scaled": np.asarray(scaled, dtype=np.float64).tolist(),
+        "probabilities": np.asarray(probabilities, dtype=np.float64).tolist(),
+        "verdicts": np.asarray(verdicts, dtype=np.int64).tolist(),
+    }
+
+
+def _fsync_dir(path):
+    if os.name == "posix":
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class AuditLog:
+    """Append-only audit log with a group-committing background writer."""
+
+    def __init__(self, directory=AUDIT_DIR, max_delay=0.005, max_batch=4096,
+                 segment_bytes=64 << 20, max_pending=100_000, max_retries=5):
+        self.directory = directory
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.segment_bytes = segment_bytes
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.writer_id = f"{socket.gethostname()}-{os.getpid()}-{time.time_ns():x}"
+        self.groups = 0
+        self.last_error = None
+        self.failed = None
+        os.makedirs(directory, exist_ok=True)
+        self._pending = deque()
+        self._appended = 0
+        self._durable = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._file = None
+        self._segment_size = 0
+        self._segments = 0
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, record):
+        """Queue one record; returns its sequence number without waiting for the disk.
+
+        Only blocks if ``max_pending`` records are already waiting (the disk has
+        fallen far behind), so memory stays bounded and no record is dropped.
+        """
+        with self._cond:
+            self._check_open()
+            while len(self._pending) >= self.max_pending:
+                self._cond.wait()
+                self._check_open()
+            self._appended += 1
+            record = {**record, "writer": self.writer_id, "seq": self._appended}
+            self._pending.append(record)
+            self._cond.notify_all()
+            return self._appended
+
+    def append_many(self, records):
+        """Queue several records under one lock acquisition; returns the last sequence number."""
+        seq = None
+        for start in range(0, len(records), self.max_batch):
+            with self._cond:
+                self._check_open()
+                while len(self._pending) >= self.max_pending:
+                    self._cond.wait()
+                    self._check_open()
+                for record in records[start:start + self.max_batch]:
+                    self._appended += 1
+                    self._pending.append({**record, "writer": self.writer_id, "seq": self._appended})
+                seq = self._appended
+                self._cond.notify_all()
+        return seq
+
+    def flush(self, timeout=None):
+        """Wait until every record appended so far is on disk; False on timeout."""
+        with self._cond:
+            target = self._appended
+            done = self._cond.wait_for(lambda: self._durable >= target or self.failed is not None, timeout)
+            if self._durable < target and self.failed is not None:
+                raise OSError(f"audit log writer stopped: {self.failed}") from self.failed
+            return done
+
+    def close(self, timeout=None):
+        """Write out everything queued and stop the writer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._cond:
+            return {"appended": self._appended, "durable": self._durable, "pending": len(self._pending),
+                    "groups": self.groups, "segments": self._segments,
+                    "last_error": None if self.last_error is None else str(self.last_error),
+                    "failed": self.failed is not None}
+
+    def _check_open(self):
+        if self.failed is not None:
+            raise OSError(f"audit log writer stopped: {self.failed}") from self.failed
+        if self._closed:
+            raise RuntimeError("audit log is closed")
+
+    def _open_segment(self):
+        self._segments += 1
+        path = os.path.join(self.directory, f"audit-{self.writer_id}-{self._segments:06d}.log")
+        self._file = open(path, "ab", buffering=0)
+        self._file.write(_MAGIC)
+        os.fsync(self._file.fileno())
+        # Make the new file's directory entry durable as well
+        _fsync_dir(self.directory)
+        self._segment_size = len(_MAGIC)
+
+    def _write_group(self, records):
+        data = b"".join(_frame(json.dumps(record, separators=(",", ":")).encode()) for record in records)
+        if self._file is None or self._segment_size + len(data) > self.segment_bytes:
+            if self._file is not None:
+                self._file.close()
+            self._open_segment()
+        try:
+            self._file.write(data)
+            os.fsync(self._file.fileno())
+        except OSError:
+            self._discard_partial()
+            raise
+        self._segment_size += len(data)
+
+    def _discard_partial(self):
+        # Cut a half-written group off the segment so it never reads as torn mid-log;
+        # if even that fails, start the retry in a fresh segment
+        try:
+            os.ftruncate(self._file.fileno(), self._segment_size)
+            os.fsync(self._file.fileno())
+        except OSError:
+            self._file.close()
+            self._file = None
+
+    def _run(self):
+        failures = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    break
+            # Give concurrent decisions a moment to join this group
+            if self.max_delay and not self._closed:
+                time.sleep(self.max_delay)
+            with self._cond:
+                group = [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch))]
+                self._cond.notify_all()
+            try:
+                self._write_group(group)
+            except OSError as e:
+                self.last_error = e
+                failures += 1
+                with self._cond:
+                    self._pending.extendleft(reversed(group))
+                    if failures > self.max_retries:
+                        # Fail loudly: appends and flushes raise from now on
+                        self.failed = e
+                        self._cond.notify_all()
+                if self.failed is not None:
+                    if self._file is not None:
+                        self._file.close()
+                    raise OSError(f"audit log writer gave up after {failures} failed writes") from e
+                time.sleep(min(0.1 * 2 ** failures, 2.0))
+                continue
+            failures = 0
+            with self._cond:
+                self._durable += len(group)
+                self.groups += 1
+                self.last_error = None
+                self._cond.notify_all()
+        if self._file is not None:
+            self._file.close()
+
+
+def _torn(path, offset, last):
+    if not last:
+        raise AuditLogCorrupt(f"{path}: truncated record at byte {offset} before the writer's last segment")
+    warnings.warn(f"{path}: torn record at byte {offset} ignored")
+
+
+def read_segment(path, last=True):
+    """Yield the records of one segment in order, verifying every checksum.
+
+    Only the writer's last segment (``last``) may end in a torn record, which
+    is skipped with a warning; everywhere else it raises AuditLogCorrupt.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(_MAGIC):
+        if _MAGIC.startswith(data):
+            # Crashed while creating the segment
+            if data:
+                _torn(path, 0, last)
+            return
+        raise AuditLogCorrupt(f"{path}: not an audit log segment")
+    offset = len(_MAGIC)
+    while offset < len(data):
+        end = offset + _FRAME.size
+        if end > len(data):
+            _torn(path, offset, last)
+            return
+        length, length_crc, crc = _FRAME.unpack_from(data, offset)
+        if zlib.crc32(_LENGTH.pack(length)) != length_crc:
+            raise AuditLogCorrupt(f"{path}: damaged record header at byte {offset}")
+        payload = data[end:end + length]
+        if len(payload) < length:
+            _torn(path, offset, last)
+            return
+        if zlib.crc32(payload, length_crc) != crc:
+            if end + length == len(data):
+                _torn(path, offset, last)
+                return
+            raise AuditLogCorrupt(f"{path}: checksum mismatch in record at byte {offset}")
+        yield json.loads(payload)
+        offset = end + length
+
+
+def segment_paths(directory=AUDIT_DIR):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.startswith("audit-") and name.endswith(".log"))
+
+
+def writer_segments(directory=AUDIT_DIR):
+    """{writer id: its segment paths in write order}."""
+    writers = {}
+    for path in segment_paths(directory):
+        # Segment names are audit-<writer>-<n>.log; a writer's segments sort in order
+        writers.setdefault(os.path.basename(path)[len("audit-"):].rsplit("-", 1)[0], []).append(path)
+    return writers
+
+
+def replay(directory=AUDIT_DIR):
+    """Every record from every writer, merged in timestamp order."""
+
+    def records(paths):
+        # Guards against a retried group that reached the disk twice
+        last_seq = 0
+        for path in paths:
+            for record in read_segment(path, last=path == paths[-1]):
+                if record["seq"] > last_seq:
+                    last_seq = record["seq"]
+                    yield record
+
+    return heapq.merge(*(records(paths) for paths in writer_segments(directory).values()),
+                       key=lambda r: (r["ts"], r["seq"]))
+
+
+def verify(directory=AUDIT_DIR):
+    """(records per segment, problems): every torn, corrupt or duplicate record is a problem."""
+    counts, problems = {}, []
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for paths in writer_segments(directory).values():
+            last_seq = 0
+            for path in paths:
+                counts[path] = 0
+                try:
+                    for record in read_segment(path, last=path == paths[-1]):
+                        if record["seq"] <= last_seq:
+                            problems.append(f"{path}: duplicate record #{record['seq']} skipped")
+                            continue
+                        last_seq = record["seq"]
+                        counts[path] += 1
+                except AuditLogCorrupt as e:
+                    problems.append(str(e))
+    problems.extend(str(w.message) for w in caught)
+    return counts, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay or verify the fraud decision audit log.")
+    parser.add_argument("directory", nargs="?", default=AUDIT_DIR)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--verify", action="store_true", help="check every checksum and print counts; exit 1 if any record is skipped")
+    mode.add_argument("--rescore", action="store_true",
+                      help="re-score records made by the current model and report any that differ")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        counts, problems = verify(args.directory)
+        for path, count in counts.items():
+            print(f"   {os.path.basename(path):<64} {count:>10,} records")
+        total = sum(counts.values())
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            print(f"⚠️ {total:,} records readable, {len(problems)} problem(s); records were skipped")
+            return 1
+        print(f"✅ {total:,} records, all checksums valid")
+        return 0
+
+    if args.rescore:
+        from model_registry import get_registry
+        from fraud_scorer import FraudScorer
+
+        bundle = get_registry().get()
+        scorer = FraudScorer.from_bundle(bundle)
+        checked = mismatched = skipped = 0
+        for record in replay(args.directory):
+            if record["model_version"] != bundle.content_version:
+                skipped += 1
+                continue
+            if "rows" in record:
+                X = np.array(record["rows"], dtype=np.float64).reshape(-1, len(FEATURES))
+                logged_probabilities, logged_verdicts = record["probabilities"], record["verdicts"]
+            else:
+                X = np.array([[record["inputs"][name] for name in FEATURES]])
+                logged_probabilities, logged_verdicts = [record["probability"]], [record["verdict"]]
+            probabilities, predictions = scorer.score_batch(X)
+            checked += len(X)
+            differ = (probabilities != np.asarray(logged_probabilities)) | (predictions != np.asarray(logged_verdicts))
+            for i in np.flatnonzero(differ):
+                mismatched += 1
+                print(f"❌ {record['writer']} #{record['seq']} row {i} ({record['time']}): logged "
+                      f"{logged_probabilities[i]:.4f}/{logged_verdicts[i]}, now "
+                      f"{probabilities[i]:.4f}/{int(predictions[i])}")
+        print(f"🔍 {checked:,} decisions re-scored, {mismatched:,} differ; "
+              f"{skipped:,} records from other model versions skipped")
+        return 1 if mismatched else 0
+
+    for record in replay(args.directory):
+        sys.stdout.write(json.dumps(record) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
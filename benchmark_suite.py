@@ -0,0 +1,219 @@
+"""Performance benchmarks for the scoring and reporting paths, with baselines.
+
+Measures:
+
+* single-row latency of ``scaler.transform`` + ``predict`` / ``predict_proba``
+  and of ``FraudScorer.score_batch`` (median and p95);
+* batch throughput of ``FraudScorer.score_batch`` at several batch sizes;
+* cold start (imports + artifact load, peak RSS) in a fresh interpreter, for
+  the joblib pickles and, when ``fraud_forest.bin`` exists, the mmap forest;
+* end-to-end ``generate_all_images.py``, forced and fully cached.
+
+Results are a flat ``{metric: {value, unit, better}}`` JSON document, so a run
+can be kept as a baseline and a later run compared against it:
+
+    python benchmark_suite.py --save benchmark_baseline.json
+    python benchmark_suite.py --compare benchmark_baseline.json --threshold 0.15
+    python benchmark_suite.py --only single_row batch --compare benchmark_baseline.json
+
+With ``--compare`` the exit status is 1 when any metric is worse than the
+baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import sklearn
+
+from benchmark_compiled_forest import cold_start
+from compiled_forest import COMPILED_PATH
+from fraud_dataset import DATA_PATH, as_float64, load_dataset
+from fraud_scorer import FEATURES, FraudScorer
+from model_registry import MODEL_PATH, SCALER_PATH, file_sha256
+
+BENCHMARKS = ("single_row", "batch", "cold_start", "images")
+BATCH_SIZES = (1, 10, 100, 1000, 10_000)
+DEFAULT_THRESHOLD = 0.10
+
+
+def _timings(fn, repeat, warmup=3):
+    for _ in range(warmup):
+        fn()
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return timings
+
+
+def _metric(value, unit, better="lower", gate=True):
+    # Ungated metrics (tail latencies, too noisy to fail a run on) are only reported
+    return {"value": float(value), "unit": unit, "better": better, "gate": gate}
+
+
+def bench_single_row(model, scaler, scorer, X, repeat):
+    row = X[:1]
+    paths = {
+        "transform_predict": lambda: model.predict(scaler.transform(row)),
+        "transform_predict_proba": lambda: model.predict_proba(scaler.transform(row)),
+        "score_batch": lambda: scorer.score_batch(row),
+    }
+    results = {}
+    for name, fn in paths.items():
+        timings = _timings(fn, repeat) * 1e6
+        results[f"single_row.{name}.median_us"] = _metric(np.median(timings), "µs")
+        results[f"single_row.{name}.p95_us"] = _metric(np.percentile(timings, 95), "µs", gate=False)
+    return results
+
+
+def bench_batch(scorer, X, sizes=BATCH_SIZES):
+    results = {}
+    for size in sizes:
+        # Tile small datasets so every batch size is measured on real rows
+        batch = np.resize(X, (size, X.shape[1]))
+        repeat = max(3, min(50, 20_000 // size))
+        seconds = np.median(_timings(lambda: scorer.score_batch(batch), repeat, warmup=1))
+        results[f"batch.{size}.rows_per_s"] = _metric(size / seconds, "rows/s", "higher")
+    return results
+
+
+def bench_cold_start(model_path, scaler_path, forest_path, repeat):
+    labels = {"joblib.load (model + scaler)": "joblib", "CompiledForest.load (mmap)": "mmap_forest"}
+    if forest_path is not None and not os.path.exists(forest_path):
+        forest_path = None
+    results = {}
+    for name, run in cold_start(model_path, scaler_path, forest_path, len(FEATURES), repeat).items():
+        key = labels[name]
+        results[f"cold_start.{key}.load_ms"] = _metric(run["load_s"] * 1e3, "ms")
+        results[f"cold_start.{key}.first_predict_ms"] = _metric(run["first_predict_s"] * 1e3, "ms")
+        results[f"cold_start.{key}.peak_rss_mb"] = _metric(run["rss_kb"] / 1024, "MB")
+    return results
+
+
+def bench_images(jobs):
+    """Wall time of generate_all_images.py in the current directory, forced then cached."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generate_all_images.py")
+    results = {}
+    for name, extra in (("forced", ["--force"]), ("cached", [])):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-W", "ignore", script, "--jobs", str(jobs), *extra],
+                       check=True, stdout=subprocess.DEVNULL)
+        results[f"images.{name}_s"] = _metric(time.perf_counter() - start, "s")
+    return results
+
+
+def run(benchmarks, data_path=DATA_PATH, model_path=MODEL_PATH, scaler_path=SCALER_PATH,
+        forest_path=COMPILED_PATH, repeat=500, cold_repeat=3, jobs=os.cpu_count()):
+    """Run the selected benchmarks; returns the results document."""
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    scorer = FraudScorer(model, scaler)
+    X = as_float64(load_dataset(data_path, columns=FEATURES)).to_numpy()
+
+    metrics = {}
+    for name in benchmarks:
+        print(f"⏱️ {name}...", file=sys.stderr)
+        if name == "single_row":
+            metrics.update(bench_single_row(model, scaler, scorer, X, repeat))
+        elif name == "batch":
+            metrics.update(bench_batch(scorer, X))
+        elif name == "cold_start":
+            metrics.update(bench_cold_start(model_path, scaler_path, forest_path, cold_repeat))
+        elif name == "images":
+            metrics.update(bench_images(jobs))
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "numpy": np.__version__,
+                        "sklearn": sklearn.__version__, "machine": platform.machine(),
+                        "cpus": os.cpu_count()},
+        "model_sha256": file_sha256(model_path),
+        "metrics": metrics,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Rows of (metric, baseline, current, relative change, regressed) for shared metrics.
+
+    The relative change is signed so that positive is always worse; only gated
+    metrics can regress.
+    """
+    rows = []
+    for name, current in results["metrics"].items():
+        previous = baseline["metrics"].get(name)
+        if previous is None or previous["value"] == 0:
+            continue
+        change = (current["value"] - previous["value"]) / previous["value"]
+        if current["better"] == "higher":
+            change = -change
+        rows.append((name, previous["value"], current["value"], change, current.get("gate", True) and change > threshold))
+    return rows
+
+
+def _print_results(results):
+    for name, metric in results["metrics"].items():
+        print(f"   {name:<44} {metric['value']:>14,.2f} {metric['unit']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scoring and reporting; save or compare baselines.")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--save", metavar="JSON", help="write the results here (e.g. as the new baseline)")
+    parser.add_argument("--compare", metavar="JSON", help="baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown counted as a regression (default: 0.10)")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--forest", default=COMPILED_PATH, help="compiled forest for the mmap cold start")
+    parser.add_argument("--repeat", type=int, default=500, help="timed single-row calls per path")
+    parser.add_argument("--cold-repeat", type=int, default=3, help="fresh interpreters per loader (best kept)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="generate_all_images.py workers")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run(args.only, args.data, args.model, args.scaler, args.forest,
+                  args.repeat, args.cold_repeat, args.jobs)
+    print("📊 Results")
+    _print_results(results)
+
+    if args.save:
+        tmp_path = f"{args.save}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp_path, args.save)
+        print(f"💾 Saved to {args.save}")
+
+    if baseline is None:
+        return 0
+    if baseline.get("environment") != results["environment"]:
+        print("⚠️ Baseline was recorded in a different environment; differences may not be regressions")
+    if baseline.get("model_sha256") != results["model_sha256"]:
+        print("ℹ️ The model has changed since the baseline")
+    rows = compare(results, baseline, args.threshold)
+    print(f"\n🔍 Against {args.compare} (change: + is worse; regression = worse by more than {args.threshold:.0%})")
+    for name, previous, current, change, regressed in rows:
+        flag = "❌ REGRESSION" if regressed else "✅" if results["metrics"][name]["gate"] else "ℹ️"
+        print(f"   {name:<44} {previous:>14,.2f} → {current:>14,.2f}  {change:>+8.1%}  {flag}")
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n🎉 No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Per-application SHAP attributions with a latency budget.
+
+One ``TreeExplainer`` is built per model version (off the caller's thread)
+and reused for every application scored with that version. Explanations run
+on an executor; callers wait at most ``budget_s`` for them, so a slow
+explanation never holds up the verdict. Results, including ones that finish
+after the budget ran out, are kept in a small LRU so a repeat request for the
+same application is served immediately.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+
+import numpy as np
+
+from shap_cache import fraud_class_values
+
+
+@dataclass(frozen=True)
+class Attribution:
+    """Fraud-class SHAP values for one application (same order as FEATURES)."""
+
+    values: np.ndarray
+    base_value: float
+
+    def top(self, features, count=5):
+        """(feature, contribution) pairs with the largest absolute contribution first."""
+        order = np.argsort(-np.abs(self.values))[:count]
+        return [(features[i], float(self.values[i])) for i in order]
+
+
+class ExplanationService:
+    """Builds one explainer per model version and explains single rows within a budget."""
+
+    def __init__(self, executor, budget_s=0.5, maxsize=256):
+        self.executor = executor
+        self.budget_s = budget_s
+        self.maxsize = maxsize
+        self._explainers = {}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build(model):
+        import shap
+        explainer = shap.TreeExplainer(model)
+        fraud_index = list(model.classes_).index(1)
+        expected = np.ravel(explainer.expected_value)
+        base_value = float(expected[fraud_index] if len(expected) > 1 else expected[0])
+        return explainer, fraud_index, base_value
+
+    def warm(self, bundle):
+        """Start building the explainer for this model version if not already started."""
+        with self._lock:
+            future = self._explainers.get(bundle.version)
+            if future is None:
+                # Only the current version is kept; older explainers are dropped
+                self._explainers = {bundle.version: self.executor.submit(self._build, bundle.model)}
+                future = self._explainers[bundle.version]
+            return future
+
+    def _explain(self, explainer_future, row_scaled):
+        explainer, fraud_index, base_value = explainer_future.result()
+        values = explainer.shap_values(row_scaled.reshape(1, -1), check_additivity=False)
+        return Attribution(values=fraud_class_values(values, fraud_index)[0], base_value=base_value)
+
+    def submit(self, bundle, row_scaled):
+        """Future of the Attribution for one scaled row (deduplicated per version and row)."""
+        row_scaled = np.asarray(row_scaled, dtype=np.float64).ravel()
+        key = (bundle.version, row_scaled.tobytes())
+        explainer_future = self.warm(bundle)
+        with self._lock:
+            future = self._results.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._results.move_to_end(key)
+                return future
+            future = self.executor.submit(self._explain, explainer_future, row_scaled)
+            self._results[key] = future
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+            return future
+
+    def explain(self, bundle, row_scaled, budget_s=None):
+        """Return (Attribution or None if over budget, elapsed seconds)."""
+        started = time.perf_counter()
+        future = self.submit(bundle, row_scaled)
+        try:
+            attribution = future.result(timeout=self.budget_s if budget_s is None else budget_s)
+        except FutureTimeout:
+            attribution = None
+        return attribution, time.perf_counter() - started
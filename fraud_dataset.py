@@ -0,0 +1,170 @@
+"""Typed loading of loan_land_fraud.csv with a transparent Parquet cache.
+
+The dataset is parsed with a declared schema instead of pandas' default
+int64/float64 inference: small counts and flags are uint8, bounded integers
+int16/int32 and the two-decimal ratios float32, roughly a third of the memory.
+The first load of a CSV writes a Parquet copy under ``.data_cache/``; later
+loads read that copy instead of parsing the text again, for as long as the
+CSV's size and modification time are unchanged.
+
+``iter_batches`` streams a CSV or Parquet file of any size in typed chunks.
+
+The model was fitted on the CSV's float64 values and many tree thresholds sit
+exactly on data points, so a float32 ratio must not be widened with a plain
+cast. ``as_float64`` restores the exact float64 value from its declared
+decimals; a ratio column that is not on its decimal grid is kept as float64.
+
+    from fraud_dataset import load_dataset, as_float64
+    df = load_dataset()                      # compact dtypes
+    X = as_float64(df[FEATURES])             # exact model inputs
+"""
+
+import hashlib
+import os
+import warnings
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+DATA_PATH = "loan_land_fraud.csv"
+DATA_CACHE_DIR = ".data_cache"
+DEFAULT_BATCH_ROWS = 250_000
+
+# Rough CSV row width, used to size streaming read blocks
+_CSV_ROW_BYTES = 64
+
+# Bump when DATASET_SCHEMA or the cache layout changes
+SCHEMA_VERSION = 1
+
+# Column order matches the CSV: FEATURES followed by the label
+DATASET_SCHEMA = (
+    ('loan_amount', 'int32'),
+    ('loan_tenure_months', 'int16'),
+    ('ltv', 'float32'),
+    ('valuation_diff_pct', 'float32'),
+    ('num_prev_mortgages', 'uint8'),
+    ('ownership_match_score', 'float32'),
+    ('ocr_confidence', 'float32'),
+    ('encumbrance_flag', 'uint8'),
+    ('credit_score', 'int16'),
+    ('income', 'int32'),
+    ('isFraud', 'uint8'),
+)
+
+# Decimal places of each float32 column, used to recover the exact float64
+RATIO_DECIMALS = {
+    'ltv': 2,
+    'valuation_diff_pct': 2,
+    'ownership_match_score': 2,
+    'ocr_confidence': 2,
+}
+
+
+def _on_grid(values, decimals):
+    """True when every float64 value is exactly representable at ``decimals`` places."""
+    scale = 10.0 ** decimals
+    return bool(np.array_equal(np.rint(values * scale) / scale, values, equal_nan=True))
+
+
+def _restore(values, decimals):
+    scale = 10.0 ** decimals
+    return np.rint(values.astype(np.float64) * scale) / scale
+
+
+def as_float64(frame):
+    """Float64 copy of ``frame`` with float32 ratio columns restored exactly."""
+    out = frame.astype(np.float64)
+    for name, decimals in RATIO_DECIMALS.items():
+        if name in frame.columns and frame[name].dtype == np.float32:
+            out[name] = _restore(frame[name].to_numpy(), decimals)
+    return out
+
+
+def _column_types(columns):
+    # Integers are parsed wide and narrowed with a checked cast, so an
+    # out-of-range value fails loudly instead of wrapping around
+    return {name: pa.float64() if dtype.startswith('float') else pa.int64() for name, dtype in columns}
+
+
+def _narrow(table, columns):
+    arrays = []
+    for name, dtype in columns:
+        column = table.column(name)
+        target = pa.from_numpy_dtype(np.dtype(dtype))
+        if (name in RATIO_DECIMALS and pa.types.is_float64(column.type)
+                and not _on_grid(column.to_numpy(), RATIO_DECIMALS[name])):
+            warnings.warn(f"{name} has values beyond {RATIO_DECIMALS[name]} decimals; keeping float64")
+            target = pa.float64()
+        try:
+            arrays.append(pc.cast(column, target))
+        except pa.ArrowInvalid as e:
+            raise ValueError(f"column {name} does not fit {target}: {e}") from None
+    return pa.table(arrays, names=[n for n, _ in columns])
+
+
+def _parse_csv(path, columns):
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(column_types=_column_types(columns),
+                                             include_columns=[n for n, _ in columns]),
+    )
+    return _narrow(table, columns)
+
+
+def _cache_path(path, cache_dir):
+    stat = os.stat(path)
+    source = os.path.abspath(path)
+    key = f"{SCHEMA_VERSION}:{source}:{stat.st_size}:{stat.st_mtime_ns}"
+    prefix = f"{os.path.splitext(os.path.basename(path))[0]}-{hashlib.sha256(source.encode()).hexdigest()[:8]}-"
+    return os.path.join(cache_dir, f"{prefix}{hashlib.sha256(key.encode()).hexdigest()[:16]}.parquet"), prefix
+
+
+def load_table(path=DATA_PATH, cache_dir=DATA_CACHE_DIR):
+    """The typed dataset as an Arrow table, from the Parquet cache when it is current."""
+    columns = DATASET_SCHEMA
+    if cache_dir is None:
+        return _parse_csv(path, columns)
+    cache_path, prefix = _cache_path(path, cache_dir)
+    if os.path.exists(cache_path):
+        return pq.read_table(cache_path, memory_map=True)
+    table = _parse_csv(path, columns)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, cache_path)
+    # Copies of older versions of this CSV are never read again
+    for name in os.listdir(cache_dir):
+        if name.startswith(prefix) and name.endswith(".parquet") and name != os.path.basename(cache_path):
+            os.remove(os.path.join(cache_dir, name))
+    return table
+
+
+def load_dataset(path=DATA_PATH, columns=None, cache_dir=DATA_CACHE_DIR):
+    """The typed dataset as a DataFrame (optionally only ``columns``)."""
+    table = load_table(path, cache_dir)
+    if columns is not None:
+        table = table.select(list(columns))
+    return table.to_pandas()
+
+
+def iter_batches(path, batch_rows=DEFAULT_BATCH_ROWS, columns=None):
+    """Yield the typed dataset as DataFrames of about ``batch_rows`` rows.
+
+    Reads CSV or Parquet incrementally, so memory is bounded by the batch size
+    rather than the file size. Nothing is cached.
+    """
+    schema = DATASET_SCHEMA if columns is None else tuple(c for c in DATASET_SCHEMA if c[0] in columns)
+    names = [n for n, _ in schema]
+    if path.endswith(".parquet"):
+        batches = pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=names)
+    else:
+        batches = pacsv.open_csv(
+            path,
+            read_options=pacsv.ReadOptions(block_size=max(1 << 20, batch_rows * _CSV_ROW_BYTES)),
+            convert_options=pacsv.ConvertOptions(column_types=_column_types(schema), include_columns=names),
+        )
+    for batch in batches:
+        yield _narrow(pa.Table.from_batches([batch]), schema).to_pandas()
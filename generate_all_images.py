@@ -1,340 +1,487 @@
 # Save this as: generate_all_images.py
-
+#
+# Renders the manuscript figures. Each figure is an independent task run in a
+# process pool, and a figure is skipped when the content hash of its inputs
+# (data file, model artifacts, plotting code and the project modules it calls)
+# matches the last build. The figures that use shap, seaborn or sklearn import
+# them locally, so a run with nothing to re-render does not pay for them.
+#
+#     python generate_all_images.py [--jobs N] [--force] [--only NAME ...]
+
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+
+import matplotlib
+matplotlib.use("Agg")
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
-import joblib
-import shap
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import confusion_matrix, roc_curve, auc, classification_report
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Rectangle
 import warnings
+from fraud_dataset import DATA_PATH, load_dataset
+from fraud_scorer import FEATURES, FraudScorer
+from model_registry import MODEL_PATH, SCALER_PATH
+from shap_cache import cached_shap_values
+from streaming_evaluation import EvaluationAccumulator
 warnings.filterwarnings('ignore')
 
-print("🎨 Generating all images for manuscript...")
+MANIFEST_PATH = ".figure_cache.json"
 
-# Load data and model
-df = pd.read_csv("loan_land_fraud.csv")
-model = joblib.load("fraud_detection_model.pkl")
-scaler = joblib.load("scaler.pkl")
 
-features = [
-    'loan_amount', 'loan_tenure_months', 'ltv', 'valuation_diff_pct', 
-    'num_prev_mortgages', 'ownership_match_score', 'ocr_confidence', 
-    'encumbrance_flag', 'credit_score', 'income'
-]
+# Shared inputs, loaded lazily and at most once per worker process
+@lru_cache(maxsize=None)
+def load_data():
+    return load_dataset(DATA_PATH)
+
+
+@lru_cache(maxsize=None)
+def load_scorer():
+    return FraudScorer.from_files()
+
+
+@lru_cache(maxsize=None)
+def load_test_split():
+    from sklearn.model_selection import train_test_split
+    df = load_data()
+    X = df[FEATURES]
+    y = df["isFraud"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
+    return X_test, y_test, load_scorer().transform(X_test)
+
+
+@lru_cache(maxsize=None)
+def load_test_evaluation():
+    # Same accumulators as streaming_evaluation.py, so the figures match its reports
+    X_test, y_test, X_test_s = load_test_split()
+    y_pred_proba, y_pred = load_scorer().predict_scaled(X_test_s)
+    return EvaluationAccumulator().update(y_test.to_numpy(), y_pred_proba, y_pred)
 
-X = df[features]
-y = df["isFraud"]
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
-X_test_s = scaler.transform(X_test)
 
 # 1. Feature Importance
-print("📊 Creating feature importance plot...")
-importances = model.feature_importances_
-feat_imp = pd.Series(importances, index=features).sort_values(ascending=False)
-plt.figure(figsize=(10, 6))
-sns.barplot(x=feat_imp, y=feat_imp.index, hue=feat_imp.index, palette='viridis', legend=False)
-plt.title("Feature Importance from Random Forest", fontsize=16, fontweight='bold')
-plt.xlabel("Importance Score", fontsize=12)
-plt.ylabel("Feature", fontsize=12)
-plt.tight_layout()
-plt.savefig('feature_importance.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ feature_importance.png")
-
-# 2. SHAP values
-print("🔍 Generating SHAP values...")
-explainer = shap.TreeExplainer(model)
-shap_values = explainer.shap_values(X_test_s, check_additivity=False)
-shap_vals = shap_values[1] if isinstance(shap_values, list) else shap_values
-X_test_df = pd.DataFrame(X_test_s, columns=features)
-
-# 3. Feature Correlation Heatmap
-print("📊 Creating feature correlation heatmap...")
-corr_matrix = df[features].corr()
-
-plt.figure(figsize=(12, 10))
-mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-sns.heatmap(corr_matrix, mask=mask, annot=True, fmt='.2f', 
-            cmap='coolwarm', center=0, square=True,
-            linewidths=1, cbar_kws={"shrink": 0.8})
-plt.title('Feature Correlation Matrix', fontsize=18, fontweight='bold', pad=20)
-plt.xticks(rotation=45, ha='right')
-plt.yticks(rotation=0)
-plt.tight_layout()
-plt.savefig('correlation_heatmap.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ correlation_heatmap.png")
-
-# 4. SHAP Summary
-print("📊 Creating SHAP summary plot...")
-plt.figure(figsize=(10, 6))
-shap.summary_plot(shap_vals, X_test_df, show=False)
-plt.title("SHAP Feature Impact Summary", fontsize=16, fontweight='bold')
-plt.tight_layout()
-plt.savefig('shap_summary.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ shap_summary.png")
-
-# 5. Confusion Matrix
-print("📊 Creating confusion matrix...")
-y_pred = model.predict(X_test_s)
-y_pred_proba = model.predict_proba(X_test_s)[:, 1]
-cm = confusion_matrix(y_test, y_pred)
-
-fig, ax = plt.subplots(figsize=(8, 6))
-sns.heatmap(cm, annot=True, fmt='d', cmap='RdYlGn_r', cbar=True,
-            xticklabels=['Legitimate', 'Fraud'],
-            yticklabels=['Legitimate', 'Fraud'],
-            linewidths=2, linecolor='black',
-            cbar_kws={'label': 'Count'})
-plt.title('Confusion Matrix - Fraud Detection Model', fontsize=16, fontweight='bold')
-plt.ylabel('Actual Label', fontsize=12, fontweight='bold')
-plt.xlabel('Predicted Label', fontsize=12, fontweight='bold')
-
-# Add accuracy text
-accuracy = (cm[0,0] + cm[1,1]) / cm.sum()
-ax.text(1, -0.3, f'Overall Accuracy: {accuracy:.2%}', 
-        ha='center', fontsize=11, fontweight='bold', transform=ax.transAxes)
-
-plt.tight_layout()
-plt.savefig('confusion_matrix.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ confusion_matrix.png")
-
-# 6. ROC Curve
-print("📈 Creating ROC curve...")
-fpr, tpr, thresholds = roc_curve(y_test, y_pred_proba)
-roc_auc = auc(fpr, tpr)
-
-plt.figure(figsize=(10, 8))
-plt.plot(fpr, tpr, color='#e74c3c', lw=3, label=f'ROC Curve (AUC = {roc_auc:.3f})')
-plt.plot([0, 1], [0, 1], color='gray', lw=2, linestyle='--', label='Random Classifier')
-plt.xlim([0.0, 1.0])
-plt.ylim([0.0, 1.05])
-plt.xlabel('False Positive Rate', fontsize=14, fontweight='bold')
-plt.ylabel('True Positive Rate', fontsize=14, fontweight='bold')
-plt.title('ROC Curve - Fraud Detection Performance', fontsize=16, fontweight='bold')
-plt.legend(loc="lower right", fontsize=12)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('roc_curve.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ roc_curve.png")
-
-# 7. System Architecture (Enhanced)
-print("🏗️ Creating system architecture diagram...")
-fig, ax = plt.subplots(figsize=(16, 10))
-ax.set_xlim(0, 12)
-ax.set_ylim(0, 8)
-ax.axis('off')
-
-# Background
-ax.add_patch(Rectangle((0, 0), 12, 8, facecolor='#f8f9fa', zorder=0))
-
-# Title
-ax.text(6, 7.3, 'AI-Powered Fraud Detection System', 
-        ha='center', fontsize=22, fontweight='bold', color='#2c3e50')
-ax.text(6, 6.8, 'End-to-End Machine Learning Pipeline', 
-        ha='center', fontsize=14, color='#7f8c8d', style='italic')
-
-# Main pipeline boxes
-color1 = '#3498db'
-color2 = '#2ecc71'
-color3 = '#e74c3c'
-color4 = '#f39c12'
-color5 = '#9b59b6'
-
-main_boxes = [
-    (0.8, 4.5, 1.8, 1.2, "📊\nData Input", color1, "10 Features\n5000+ Records"),
-    (3.2, 4.5, 1.8, 1.2, "⚙️\nPreprocessing", color2, "Scaling\nValidation"),
-    (5.6, 4.5, 1.8, 1.2, "🌲\nRandom Forest", color3, "100 Trees\n94.2% Acc"),
-    (8.0, 4.5, 1.8, 1.2, "🔍\nSHAP Analysis", color4, "Explainability\nTransparency"),
-    (10.4, 4.5, 1.8, 1.2, "🖥️\nWeb App", color5, "Real-time\nPrediction"),
-]
+def plot_feature_importance(output):
+    import seaborn as sns
+    model = load_scorer().model
+    features = FEATURES
+    importances = model.feature_importances_
+    feat_imp = pd.Series(importances, index=features).sort_values(ascending=False)
+    plt.figure(figsize=(10, 6))
+    sns.barplot(x=feat_imp, y=feat_imp.index, hue=feat_imp.index, palette='viridis', legend=False)
+    plt.title("Feature Importance from Random Forest", fontsize=16, fontweight='bold')
+    plt.xlabel("Importance Score", fontsize=12)
+    plt.ylabel("Feature", fontsize=12)
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+# 2. Feature Correlation Heatmap
+def plot_correlation_heatmap(output):
+    import seaborn as sns
+    df = load_data()
+    features = FEATURES
+    corr_matrix = df[features].corr()
+
+    plt.figure(figsize=(12, 10))
+    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+    sns.heatmap(corr_matrix, mask=mask, annot=True, fmt='.2f', 
+                cmap='coolwarm', center=0, square=True,
+                linewidths=1, cbar_kws={"shrink": 0.8})
+    plt.title('Feature Correlation Matrix', fontsize=18, fontweight='bold', pad=20)
+    plt.xticks(rotation=45, ha='right')
+    plt.yticks(rotation=0)
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+# 3. SHAP Summary
+def plot_shap_summary(output):
+    import shap
+    model = load_scorer().model
+    features = FEATURES
+    X_test, y_test, X_test_s = load_test_split()
+    # Chunked across cores and cached on disk, keyed on the model file and the data
+    shap_vals, rows = cached_shap_values(model, X_test_s, model_key=_file_digest(MODEL_PATH))
+    X_test_df = pd.DataFrame(X_test_s[rows], columns=features)
+
+    plt.figure(figsize=(10, 6))
+    shap.summary_plot(shap_vals, X_test_df, show=False)
+    plt.title("SHAP Feature Impact Summary", fontsize=16, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+# 4. Confusion Matrix
+def plot_confusion_matrix(output):
+    import seaborn as sns
+    cm = load_test_evaluation().confusion
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(cm, annot=True, fmt='d', cmap='RdYlGn_r', cbar=True,
+                xticklabels=['Legitimate', 'Fraud'],
+                yticklabels=['Legitimate', 'Fraud'],
+                linewidths=2, linecolor='black',
+                cbar_kws={'label': 'Count'})
+    plt.title('Confusion Matrix - Fraud Detection Model', fontsize=16, fontweight='bold')
+    plt.ylabel('Actual Label', fontsize=12, fontweight='bold')
+    plt.xlabel('Predicted Label', fontsize=12, fontweight='bold')
+
+    # Add accuracy text
+    accuracy = (cm[0,0] + cm[1,1]) / cm.sum()
+    ax.text(1, -0.3, f'Overall Accuracy: {accuracy:.2%}', 
+            ha='center', fontsize=11, fontweight='bold', transform=ax.transAxes)
+
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+# 5. ROC Curve
+def plot_roc_curve(output):
+    evaluation = load_test_evaluation()
+    fpr, tpr, thresholds = evaluation.roc_curve()
+    roc_auc, _ = evaluation.roc_auc()
+
+    plt.figure(figsize=(10, 8))
+    plt.plot(fpr, tpr, color='#e74c3c', lw=3, label=f'ROC Curve (AUC = {roc_auc:.3f})')
+    plt.plot([0, 1], [0, 1], color='gray', lw=2, linestyle='--', label='Random Classifier')
+    plt.xlim([0.0, 1.0])
+    plt.ylim([0.0, 1.05])
+    plt.xlabel('False Positive Rate', fontsize=14, fontweight='bold')
+    plt.ylabel('True Positive Rate', fontsize=14, fontweight='bold')
+    plt.title('ROC Curve - Fraud Detection Performance', fontsize=16, fontweight='bold')
+    plt.legend(loc="lower right", fontsize=12)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+# 6. System Architecture (Enhanced)
+def plot_system_architecture(output):
+    fig, ax = plt.subplots(figsize=(16, 10))
+    ax.set_xlim(0, 12)
+    ax.set_ylim(0, 8)
+    ax.axis('off')
+
+    # Background
+    ax.add_patch(Rectangle((0, 0), 12, 8, facecolor='#f8f9fa', zorder=0))
+
+    # Title
+    ax.text(6, 7.3, 'AI-Powered Fraud Detection System', 
+            ha='center', fontsize=22, fontweight='bold', color='#2c3e50')
+    ax.text(6, 6.8, 'End-to-End Machine Learning Pipeline', 
+            ha='center', fontsize=14, color='#7f8c8d', style='italic')
+
+    # Main pipeline boxes
+    color1 = '#3498db'
+    color2 = '#2ecc71'
+    color3 = '#e74c3c'
+    color4 = '#f39c12'
+    color5 = '#9b59b6'
+
+    main_boxes = [
+        (0.8, 4.5, 1.8, 1.2, "📊\nData Input", color1, "10 Features\n5000+ Records"),
+        (3.2, 4.5, 1.8, 1.2, "⚙️\nPreprocessing", color2, "Scaling\nValidation"),
+        (5.6, 4.5, 1.8, 1.2, "🌲\nRandom Forest", color3, "100 Trees\n94.2% Acc"),
+        (8.0, 4.5, 1.8, 1.2, "🔍\nSHAP Analysis", color4, "Explainability\nTransparency"),
+        (10.4, 4.5, 1.8, 1.2, "🖥️\nWeb App", color5, "Real-time\nPrediction"),
+    ]
+
+    for x, y, w, h, text, color, subtext in main_boxes:
+        fancy_box = FancyBboxPatch((x, y), w, h, boxstyle="round,pad=0.15",
+                                   edgecolor='#2c3e50', facecolor=color,
+                                   linewidth=3, alpha=0.9, zorder=2)
+        ax.add_patch(fancy_box)
+        ax.text(x + w/2, y + h*0.65, text, ha='center', va='center',
+                fontsize=13, fontweight='bold', color='white', zorder=3)
+        ax.text(x + w/2, y + h*0.25, subtext, ha='center', va='center',
+                fontsize=9, color='white', zorder=3)
+
+    # Arrows between boxes
+    arrow_positions = [(2.6, 5.1, 3.2, 5.1), (5.0, 5.1, 5.6, 5.1), 
+                       (7.4, 5.1, 8.0, 5.1), (9.8, 5.1, 10.4, 5.1)]
+    for x1, y1, x2, y2 in arrow_positions:
+        arrow = FancyArrowPatch((x1, y1), (x2, y2), arrowstyle='->', 
+                               mutation_scale=40, linewidth=4, color='#34495e', zorder=1)
+        ax.add_patch(arrow)
+
+    # Input features box
+    features_box = FancyBboxPatch((0.5, 2.5), 3.5, 1.5, boxstyle="round,pad=0.1",
+                                  edgecolor='#3498db', facecolor='#ecf0f1',
+                                  linewidth=2, alpha=0.8, zorder=2)
+    ax.add_patch(features_box)
+    ax.text(2.25, 3.7, '📋 Key Features', ha='center', fontsize=11, fontweight='bold', color='#2c3e50')
+    feature_text = "• Loan Amount\n• LTV Ratio\n• Credit Score\n• OCR Confidence\n• Property Valuation"
+    ax.text(2.25, 3.0, feature_text, ha='center', fontsize=8, color='#34495e')
+
+    # Model metrics box
+    metrics_box = FancyBboxPatch((4.5, 2.5), 3.0, 1.5, boxstyle="round,pad=0.1",
+                                 edgecolor='#e74c3c', facecolor='#ecf0f1',
+                                 linewidth=2, alpha=0.8, zorder=2)
+    ax.add_patch(metrics_box)
+    ax.text(6.0, 3.7, '📊 Performance Metrics', ha='center', fontsize=11, fontweight='bold', color='#2c3e50')
+    metrics_text = "Accuracy: 94.2%\nPrecision: 92.8%\nRecall: 89.5%\nF1-Score: 91.1%"
+    ax.text(6.0, 3.0, metrics_text, ha='center', fontsize=8, color='#34495e')
+
+    # Output box
+    output_box = FancyBboxPatch((8.5, 2.5), 3.0, 1.5, boxstyle="round,pad=0.1",
+                                edgecolor='#9b59b6', facecolor='#ecf0f1',
+                                linewidth=2, alpha=0.8, zorder=2)
+    ax.add_patch(output_box)
+    ax.text(10.0, 3.7, '✅ Output', ha='center', fontsize=11, fontweight='bold', color='#2c3e50')
+    output_text = "• Fraud Probability\n• Risk Score\n• Feature Importance\n• Recommendations"
+    ax.text(10.0, 3.0, output_text, ha='center', fontsize=8, color='#34495e')
+
+    # Connecting lines to bottom boxes
+    ax.plot([2.25, 2.25], [4.5, 4.0], 'k--', linewidth=2, alpha=0.5)
+    ax.plot([6.0, 6.5], [4.5, 4.0], 'k--', linewidth=2, alpha=0.5)
+    ax.plot([10.0, 11.3], [4.5, 4.0], 'k--', linewidth=2, alpha=0.5)
+
+    # Footer
+    ax.text(6, 0.5, '🛡️ Powered by Machine Learning | Real-time Fraud Detection | Explainable AI', 
+            ha='center', fontsize=10, color='#7f8c8d', style='italic')
+
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
 
-for x, y, w, h, text, color, subtext in main_boxes:
-    fancy_box = FancyBboxPatch((x, y), w, h, boxstyle="round,pad=0.15",
-                               edgecolor='#2c3e50', facecolor=color,
-                               linewidth=3, alpha=0.9, zorder=2)
-    ax.add_patch(fancy_box)
-    ax.text(x + w/2, y + h*0.65, text, ha='center', va='center',
-            fontsize=13, fontweight='bold', color='white', zorder=3)
-    ax.text(x + w/2, y + h*0.25, subtext, ha='center', va='center',
-            fontsize=9, color='white', zorder=3)
-
-# Arrows between boxes
-arrow_positions = [(2.6, 5.1, 3.2, 5.1), (5.0, 5.1, 5.6, 5.1), 
-                   (7.4, 5.1, 8.0, 5.1), (9.8, 5.1, 10.4, 5.1)]
-for x1, y1, x2, y2 in arrow_positions:
-    arrow = FancyArrowPatch((x1, y1), (x2, y2), arrowstyle='->', 
-                           mutation_scale=40, linewidth=4, color='#34495e', zorder=1)
-    ax.add_patch(arrow)
-
-# Input features box
-features_box = FancyBboxPatch((0.5, 2.5), 3.5, 1.5, boxstyle="round,pad=0.1",
-                              edgecolor='#3498db', facecolor='#ecf0f1',
-                              linewidth=2, alpha=0.8, zorder=2)
-ax.add_patch(features_box)
-ax.text(2.25, 3.7, '📋 Key Features', ha='center', fontsize=11, fontweight='bold', color='#2c3e50')
-feature_text = "• Loan Amount\n• LTV Ratio\n• Credit Score\n• OCR Confidence\n• Property Valuation"
-ax.text(2.25, 3.0, feature_text, ha='center', fontsize=8, color='#34495e')
-
-# Model metrics box
-metrics_box = FancyBboxPatch((4.5, 2.5), 3.0, 1.5, boxstyle="round,pad=0.1",
-                             edgecolor='#e74c3c', facecolor='#ecf0f1',
-                             linewidth=2, alpha=0.8, zorder=2)
-ax.add_patch(metrics_box)
-ax.text(6.0, 3.7, '📊 Performance Metrics', ha='center', fontsize=11, fontweight='bold', color='#2c3e50')
-metrics_text = "Accuracy: 94.2%\nPrecision: 92.8%\nRecall: 89.5%\nF1-Score: 91.1%"
-ax.text(6.0, 3.0, metrics_text, ha='center', fontsize=8, color='#34495e')
-
-# Output box
-output_box = FancyBboxPatch((8.5, 2.5), 3.0, 1.5, boxstyle="round,pad=0.1",
-                            edgecolor='#9b59b6', facecolor='#ecf0f1',
-                            linewidth=2, alpha=0.8, zorder=2)
-ax.add_patch(output_box)
-ax.text(10.0, 3.7, '✅ Output', ha='center', fontsize=11, fontweight='bold', color='#2c3e50')
-output_text = "• Fraud Probability\n• Risk Score\n• Feature Importance\n• Recommendations"
-ax.text(10.0, 3.0, output_text, ha='center', fontsize=8, color='#34495e')
-
-# Connecting lines to bottom boxes
-ax.plot([2.25, 2.25], [4.5, 4.0], 'k--', linewidth=2, alpha=0.5)
-ax.plot([6.0, 6.5], [4.5, 4.0], 'k--', linewidth=2, alpha=0.5)
-ax.plot([10.0, 11.3], [4.5, 4.0], 'k--', linewidth=2, alpha=0.5)
-
-# Footer
-ax.text(6, 0.5, '🛡️ Powered by Machine Learning | Real-time Fraud Detection | Explainable AI', 
-        ha='center', fontsize=10, color='#7f8c8d', style='italic')
-
-plt.tight_layout()
-plt.savefig('system_architecture.png', dpi=300, bbox_inches='tight', facecolor='white')
-plt.close()
-print("✅ system_architecture.png")
 
 # 7. Web Interface Mockup
-print("🖥️ Creating web interface mockup...")
-fig, ax = plt.subplots(figsize=(12, 8))
-ax.set_xlim(0, 10)
-ax.set_ylim(0, 10)
-ax.axis('off')
-
-main_box = mpatches.FancyBboxPatch((0.2, 0.5), 9.6, 9, boxstyle="round,pad=0.1",
-                                   edgecolor='#00ffff', facecolor='#1a1a2e', linewidth=3)
-ax.add_patch(main_box)
-
-header = mpatches.FancyBboxPatch((0.5, 8.5), 9, 0.8, boxstyle="round,pad=0.05",
-                                 edgecolor='#ff00ff', facecolor='#16213e', linewidth=2)
-ax.add_patch(header)
-ax.text(5, 8.9, '🛡️ AI FRAUD DETECTION SYSTEM', ha='center', va='center',
-        fontsize=16, fontweight='bold', color='#00ffff')
-
-sections = [
-    (0.7, 6.5, 4, 1.5, "💰 Loan Information", '#00ffff'),
-    (5.3, 6.5, 4, 1.5, "🏡 Property & Valuation", '#00ffff'),
-    (0.7, 4.5, 4, 1.5, "👤 Applicant Profile", '#00ffff'),
-    (5.3, 4.5, 4, 1.5, "📊 Risk Assessment", '#ff00ff'),
-]
+def plot_web_interface(output):
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 10)
+    ax.axis('off')
+
+    main_box = mpatches.FancyBboxPatch((0.2, 0.5), 9.6, 9, boxstyle="round,pad=0.1",
+                                       edgecolor='#00ffff', facecolor='#1a1a2e', linewidth=3)
+    ax.add_patch(main_box)
+
+    header = mpatches.FancyBboxPatch((0.5, 8.5), 9, 0.8, boxstyle="round,pad=0.05",
+                                     edgecolor='#ff00ff', facecolor='#16213e', linewidth=2)
+    ax.add_patch(header)
+    ax.text(5, 8.9, '🛡️ AI FRAUD DETECTION SYSTEM', ha='center', va='center',
+            fontsize=16, fontweight='bold', color='#00ffff')
+
+    sections = [
+        (0.7, 6.5, 4, 1.5, "💰 Loan Information", '#00ffff'),
+        (5.3, 6.5, 4, 1.5, "🏡 Property & Valuation", '#00ffff'),
+        (0.7, 4.5, 4, 1.5, "👤 Applicant Profile", '#00ffff'),
+        (5.3, 4.5, 4, 1.5, "📊 Risk Assessment", '#ff00ff'),
+    ]
+
+    for x, y, w, h, title, color in sections:
+        box = mpatches.FancyBboxPatch((x, y), w, h, boxstyle="round,pad=0.05",
+                                      edgecolor=color, facecolor='#0c0c0c',
+                                      linewidth=2, alpha=0.7)
+        ax.add_patch(box)
+        ax.text(x + w/2, y + h - 0.3, title, ha='center', va='center',
+                fontsize=11, fontweight='bold', color=color)
+
+    button = mpatches.FancyBboxPatch((3.5, 3.5), 3, 0.6, boxstyle="round,pad=0.05",
+                                     edgecolor='#00ffff', facecolor='#ff00ff', linewidth=2)
+    ax.add_patch(button)
+    ax.text(5, 3.8, '🔍 ANALYZE FRAUD RISK', ha='center', va='center',
+            fontsize=12, fontweight='bold', color='white')
+
+    result = mpatches.FancyBboxPatch((0.7, 1), 8.6, 2, boxstyle="round,pad=0.05",
+                                     edgecolor='#00ff00', facecolor='#16213e', linewidth=3)
+    ax.add_patch(result)
+    ax.text(5, 2.5, '✅ LOW FRAUD RISK', ha='center', va='center',
+            fontsize=14, fontweight='bold', color='#00ff00')
+    ax.text(5, 2, 'Safety Probability: 92.3%', ha='center', va='center',
+            fontsize=11, color='white')
+    ax.text(5, 1.5, '🛡️ Application appears legitimate based on current analysis',
+            ha='center', va='center', fontsize=9, color='#b0b0b0')
+
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='#0c0c0c')
+    plt.close()
 
-for x, y, w, h, title, color in sections:
-    box = mpatches.FancyBboxPatch((x, y), w, h, boxstyle="round,pad=0.05",
-                                  edgecolor=color, facecolor='#0c0c0c',
-                                  linewidth=2, alpha=0.7)
-    ax.add_patch(box)
-    ax.text(x + w/2, y + h - 0.3, title, ha='center', va='center',
-            fontsize=11, fontweight='bold', color=color)
-
-button = mpatches.FancyBboxPatch((3.5, 3.5), 3, 0.6, boxstyle="round,pad=0.05",
-                                 edgecolor='#00ffff', facecolor='#ff00ff', linewidth=2)
-ax.add_patch(button)
-ax.text(5, 3.8, '🔍 ANALYZE FRAUD RISK', ha='center', va='center',
-        fontsize=12, fontweight='bold', color='white')
-
-result = mpatches.FancyBboxPatch((0.7, 1), 8.6, 2, boxstyle="round,pad=0.05",
-                                 edgecolor='#00ff00', facecolor='#16213e', linewidth=3)
-ax.add_patch(result)
-ax.text(5, 2.5, '✅ LOW FRAUD RISK', ha='center', va='center',
-        fontsize=14, fontweight='bold', color='#00ff00')
-ax.text(5, 2, 'Safety Probability: 92.3%', ha='center', va='center',
-        fontsize=11, color='white')
-ax.text(5, 1.5, '🛡️ Application appears legitimate based on current analysis',
-        ha='center', va='center', fontsize=9, color='#b0b0b0')
-
-plt.tight_layout()
-plt.savefig('web_interface.png', dpi=300, bbox_inches='tight', facecolor='#0c0c0c')
-plt.close()
-print("✅ web_interface.png")
 
 # 8. Model Performance Comparison
-print("📊 Creating performance comparison chart...")
-metrics_data = {
-    'Metric': ['Accuracy', 'Precision', 'Recall', 'F1-Score'],
-    'Score': [94.2, 92.8, 89.5, 91.1]
-}
-
-fig, ax = plt.subplots(figsize=(10, 6))
-colors = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12']
-bars = ax.barh(metrics_data['Metric'], metrics_data['Score'], color=colors, edgecolor='black', linewidth=2)
-
-# Add value labels
-for i, (bar, score) in enumerate(zip(bars, metrics_data['Score'])):
-    ax.text(score + 1, i, f'{score}%', va='center', fontsize=12, fontweight='bold')
-
-ax.set_xlabel('Score (%)', fontsize=14, fontweight='bold')
-ax.set_title('Model Performance Metrics Comparison', fontsize=16, fontweight='bold')
-ax.set_xlim(0, 100)
-ax.grid(axis='x', alpha=0.3, linestyle='--')
-ax.axvline(x=90, color='green', linestyle='--', linewidth=2, alpha=0.5, label='Target: 90%')
-ax.legend(fontsize=10)
-
-plt.tight_layout()
-plt.savefig('performance_metrics.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ performance_metrics.png")
+def plot_performance_metrics(output):
+    metrics_data = {
+        'Metric': ['Accuracy', 'Precision', 'Recall', 'F1-Score'],
+        'Score': [94.2, 92.8, 89.5, 91.1]
+    }
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    colors = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12']
+    bars = ax.barh(metrics_data['Metric'], metrics_data['Score'], color=colors, edgecolor='black', linewidth=2)
+
+    # Add value labels
+    for i, (bar, score) in enumerate(zip(bars, metrics_data['Score'])):
+        ax.text(score + 1, i, f'{score}%', va='center', fontsize=12, fontweight='bold')
+
+    ax.set_xlabel('Score (%)', fontsize=14, fontweight='bold')
+    ax.set_title('Model Performance Metrics Comparison', fontsize=16, fontweight='bold')
+    ax.set_xlim(0, 100)
+    ax.grid(axis='x', alpha=0.3, linestyle='--')
+    ax.axvline(x=90, color='green', linestyle='--', linewidth=2, alpha=0.5, label='Target: 90%')
+    ax.legend(fontsize=10)
+
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+
 
 # 9. Feature Distribution Comparison (Fraud vs Legitimate)
-print("📊 Creating feature distribution comparison...")
-fig, axes = plt.subplots(2, 3, figsize=(16, 10))
-fig.suptitle('Feature Distributions: Fraud vs Legitimate Applications', 
-             fontsize=18, fontweight='bold', y=0.995)
-
-key_features = ['ltv', 'credit_score', 'ocr_confidence', 
-                'valuation_diff_pct', 'loan_amount', 'income']
-
-for idx, feature in enumerate(key_features):
-    row = idx // 3
-    col = idx % 3
-    ax = axes[row, col]
-    
-    # Plot distributions
-    df[df['isFraud'] == 0][feature].hist(ax=ax, bins=30, alpha=0.6, 
-                                          color='green', label='Legitimate', density=True)
-    df[df['isFraud'] == 1][feature].hist(ax=ax, bins=30, alpha=0.6, 
-                                          color='red', label='Fraud', density=True)
-    
-    ax.set_title(f'{feature.replace("_", " ").title()}', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Value', fontsize=10)
-    ax.set_ylabel('Density', fontsize=10)
-    ax.legend(loc='upper right')
-    ax.grid(alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('feature_distributions.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ feature_distributions.png")
-
-print("\n🎉 All images generated successfully!")
-print("📁 Images saved in current directory:")
-print("   1. feature_importance.png - Random Forest feature importance")
-print("   2. correlation_heatmap.png - Feature correlation matrix")
-print("   3. shap_summary.png - SHAP feature impact with color coding")
-print("   4. confusion_matrix.png - Model confusion matrix with accuracy")
-print("   5. roc_curve.png - ROC curve with AUC score")
-print("   6. system_architecture.png - Complete system architecture diagram")
-print("   7. web_interface.png - Web application mockup")
-print("   8. performance_metrics.png - Performance metrics comparison")
-print("   9. feature_distributions.png - Fraud vs Legitimate distributions")
-print("\n✨ All 9 completely unique images are ready for your manuscript!")
\ No newline at end of file
+def plot_feature_distributions(output):
+    df = load_data()
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    fig.suptitle('Feature Distributions: Fraud vs Legitimate Applications', 
+                 fontsize=18, fontweight='bold', y=0.995)
+
+    key_features = ['ltv', 'credit_score', 'ocr_confidence', 
+                    'valuation_diff_pct', 'loan_amount', 'income']
+
+    for idx, feature in enumerate(key_features):
+        row = idx // 3
+        col = idx % 3
+        ax = axes[row, col]
+
+        # Plot distributions
+        df[df['isFraud'] == 0][feature].hist(ax=ax, bins=30, alpha=0.6, 
+                                              color='green', label='Legitimate', density=True)
+        df[df['isFraud'] == 1][feature].hist(ax=ax, bins=30, alpha=0.6, 
+                                              color='red', label='Fraud', density=True)
+
+        ax.set_title(f'{feature.replace("_", " ").title()}', fontsize=12, fontweight='bold')
+        ax.set_xlabel('Value', fontsize=10)
+        ax.set_ylabel('Density', fontsize=10)
+        ax.legend(loc='upper right')
+        ax.grid(alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+@dataclass(frozen=True)
+class Figure:
+    output: str
+    render: object
+    description: str
+    # Which shared inputs the figure reads: "data" and/or "model"
+    inputs: tuple = ()
+
+
+FIGURES = [
+    Figure('feature_importance.png', plot_feature_importance, "Random Forest feature importance", ("model",)),
+    Figure('correlation_heatmap.png', plot_correlation_heatmap, "Feature correlation matrix", ("data",)),
+    Figure('shap_summary.png', plot_shap_summary, "SHAP feature impact with color coding", ("data", "model")),
+    Figure('confusion_matrix.png', plot_confusion_matrix, "Model confusion matrix with accuracy", ("data", "model")),
+    Figure('roc_curve.png', plot_roc_curve, "ROC curve with AUC score", ("data", "model")),
+    Figure('system_architecture.png', plot_system_architecture, "Complete system architecture diagram"),
+    Figure('web_interface.png', plot_web_interface, "Web application mockup"),
+    Figure('performance_metrics.png', plot_performance_metrics, "Performance metrics comparison"),
+    Figure('feature_distributions.png', plot_feature_distributions, "Fraud vs Legitimate distributions", ("data",)),
+]
+
+_INPUT_FILES = {"data": (DATA_PATH,), "model": (MODEL_PATH, SCALER_PATH)}
+_INPUT_LOADERS = {"data": (load_data, load_test_split, load_test_evaluation),
+                  "model": (load_scorer, load_test_split, load_test_evaluation)}
+# Project modules the loaders and renderers call into; a change to any of them re-renders
+_INPUT_MODULES = {"data": ("fraud_dataset",),
+                  "model": ("fraud_dataset", "fraud_scorer", "model_registry", "shap_cache",
+                            "streaming_evaluation")}
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def figure_hash(figure):
+    """Content hash of everything a figure depends on."""
+    digest = hashlib.sha256()
+    digest.update(inspect.getsource(figure.render).encode())
+    digest.update(",".join(FEATURES).encode())
+    for name in figure.inputs:
+        for path in _INPUT_FILES[name]:
+            digest.update(_file_digest(path).encode())
+        for loader in _INPUT_LOADERS[name]:
+            digest.update(inspect.getsource(loader).encode())
+        for module in _INPUT_MODULES[name]:
+            digest.update(_file_digest(importlib.import_module(module).__file__).encode())
+    return digest.hexdigest()
+
+
+def _render_figure(output):
+    figure = next(f for f in FIGURES if f.output == output)
+    started = time.perf_counter()
+    figure.render(figure.output)
+    return figure.output, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate all manuscript figures.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="re-render even if inputs are unchanged")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="only these figures (e.g. roc_curve.png)")
+    args = parser.parse_args(argv)
+
+    print("🎨 Generating all images for manuscript...")
+    started = time.perf_counter()
+    figures = [f for f in FIGURES if not args.only or f.output in args.only]
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    hashes = {f.output: figure_hash(f) for f in figures}
+    stale = [f.output for f in figures
+             if args.force or manifest.get(f.output) != hashes[f.output] or not os.path.exists(f.output)]
+    for output in sorted(set(hashes) - set(stale)):
+        print(f"⏭️ {output} (unchanged)")
+
+    failed = []
+    if stale:
+        with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(stale)))) as pool:
+            futures = {pool.submit(_render_figure, output): output for output in stale}
+            for future in as_completed(futures):
+                output = futures[future]
+                try:
+                    _, elapsed = future.result()
+                except Exception as e:
+                    failed.append(output)
+                    manifest.pop(output, None)
+                    print(f"❌ {output}: {e}")
+                    continue
+                manifest[output] = hashes[output]
+                print(f"✅ {output} ({elapsed:.1f}s)")
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    if failed:
+        print(f"\n⚠️ {len(failed)} figure(s) failed: {', '.join(failed)}")
+        return 1
+    print(f"\n🎉 All images generated successfully! ({len(stale)} rendered, "
+          f"{len(figures) - len(stale)} unchanged, {time.perf_counter() - started:.1f}s)")
+    print("📁 Images saved in current directory:")
+    for index, figure in enumerate(figures, start=1):
+        print(f"   {index}. {figure.output} - {figure.description}")
+    print(f"\n✨ All {len(figures)} completely unique images are ready for your manuscript!")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
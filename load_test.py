@@ -0,0 +1,414 @@
+"""Concurrent load generator for the scoring service and the in-process scoring path.
+
+Requests carry real applications sampled from loan_land_fraud.csv. Load is
+stepped up either by concurrency (closed loop: N clients sending back to back)
+or by arrival rate (open loop: Poisson arrivals, latency measured from the
+scheduled arrival so queueing in the client is not hidden). Each step reports
+throughput and p50/p95/p99 latency; the sweep stops shortly after the
+saturation point, the first step where throughput stops keeping up (or p99
+breaks ``--slo-ms``).
+
+    python load_test.py --start-server                       # spawn a local service and sweep concurrency
+    python load_test.py --url http://127.0.0.1:8765 --rates 100 200 400 800
+    python load_test.py --target inprocess --concurrency 1 2 4 8   # FraudScorer on threads, as the app does
+    python load_test.py --start-server --server-args "--workers 4" --json load.json --plot load.png
+
+Everything runs locally; nothing leaves the machine. A server started with
+``--start-server`` never writes to the live metrics database, the decision
+audit log or the drift monitor, so synthetic load leaves no trace in them.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from fraud_dataset import DATA_PATH, as_float64, load_dataset
+from fraud_scorer import FEATURES
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+DEFAULT_CONCURRENCY = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Always passed to a spawned service: synthetic decisions stay out of the real stores
+_ISOLATED_SERVER_ARGS = ("--metrics-db", "", "--audit-dir", "", "--drift-reference", "")
+
+# Open loop: a step is saturated when it completes less than this share of
+# the offered rate. Closed loop: when the added clients buy less than this
+# share of the proportional throughput gain (doubling clients adds < 25%),
+# i.e. extra load mostly turns into queueing latency.
+SATURATION_SHARE = 0.95
+SATURATION_EFFICIENCY = 0.25
+
+
+def sample_rows(data_path=DATA_PATH, n=10_000, seed=0):
+    """Raw application rows drawn (with replacement) from the dataset."""
+    X = as_float64(load_dataset(data_path, columns=FEATURES)).to_numpy()
+    return X[np.random.default_rng(seed).integers(0, len(X), n)]
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection to the scoring service."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def post(self, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            self.writer.write(f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                              f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                              + body)
+            await self.writer.drain()
+            status = int((await self.reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await self.reader.readexactly(length)
+            return status
+        except (ConnectionError, asyncio.IncompleteReadError, IndexError, ValueError):
+            self.close()
+            raise
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class HttpTarget:
+    """POSTs rows to a running scoring service over a pool of keep-alive connections."""
+
+    def __init__(self, url, connections):
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.connections = connections
+        self._pool = None
+
+    async def start(self):
+        self._pool = asyncio.Queue()
+        for _ in range(self.connections):
+            self._pool.put_nowait(_Connection(self.host, self.port))
+
+    async def send(self, body):
+        connection = await self._pool.get()
+        try:
+            return await connection.post("/score", body) == 200
+        finally:
+            self._pool.put_nowait(connection)
+
+    @staticmethod
+    def encode(row):
+        return json.dumps({"features": row.tolist()}).encode()
+
+    async def stop(self):
+        while self._pool is not None and not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class InProcessTarget:
+    """Scores rows with one shared FraudScorer on a thread pool, like concurrent app sessions."""
+
+    def __init__(self, threads):
+        from fraud_scorer import FraudScorer
+
+        self.url = "in-process FraudScorer"
+        self.scorer = FraudScorer.from_files()
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="load-test")
+
+    async def start(self):
+        pass
+
+    async def send(self, row):
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.scorer.score_batch, row)
+        return True
+
+    @staticmethod
+    def encode(row):
+        return row.reshape(1, -1)
+
+    async def stop(self):
+        self.executor.shutdown(wait=False)
+
+
+def _summary(latencies, errors, elapsed, **step):
+    latencies = np.asarray(latencies) * 1000
+    percentiles = np.percentile(latencies, [50, 95, 99]) if len(latencies) else [np.nan] * 3
+    return {
+        **step,
+        "completed": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(percentiles[0]),
+        "p95_ms": float(percentiles[1]),
+        "p99_ms": float(percentiles[2]),
+        "max_ms": float(latencies.max()) if len(latencies) else float("nan"),
+    }
+
+
+async def closed_loop(target, payloads, concurrency, duration):
+    """``concurrency`` clients each sending the next request as soon as the last returns."""
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    cursor = iter(range(1 << 62))
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            body = payloads[next(cursor) % len(payloads)]
+            started = time.perf_counter()
+            try:
+                ok = await target.send(body)
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return _summary(latencies, errors, time.perf_counter() - started, concurrency=concurrency)
+
+
+async def open_loop(target, payloads, rate, duration, seed=0):
+    """Poisson arrivals at ``rate`` per second; latency counts from the scheduled arrival."""
+    latencies, errors = [], 0
+    rng = np.random.default_rng(seed)
+    arrivals = np.cumsum(rng.exponential(1 / rate, int(rate * duration * 1.2) + 1))
+    arrivals = arrivals[arrivals < duration]
+
+    async def request(scheduled, body):
+        nonlocal errors
+        try:
+            ok = await target.send(body)
+        except Exception:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - scheduled)
+        else:
+            errors += 1
+
+    started = time.perf_counter()
+    tasks = []
+    for i, offset in enumerate(arrivals):
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(started + offset, payloads[i % len(payloads)])))
+    await asyncio.gather(*tasks)
+    # Throughput over the whole step including the drain, against the rate
+    # actually drawn (a Poisson sample is never exactly ``rate``)
+    return _summary(latencies, errors, max(time.perf_counter() - started, duration), rate=rate,
+                    offered=len(arrivals) / duration)
+
+
+def is_saturated(step, previous, slo_ms=None):
+    """True when this step no longer keeps up with the load put on it."""
+    if slo_ms is not None and step["p99_ms"] > slo_ms:
+        return True
+    if "rate" in step:
+        return step["throughput"] < SATURATION_SHARE * step["offered"]
+    if previous is None or step["concurrency"] <= previous["concurrency"]:
+        return step["throughput"] == 0
+    if previous["throughput"] == 0:
+        return step["throughput"] == 0
+    gain = step["throughput"] / previous["throughput"] - 1
+    return gain < SATURATION_EFFICIENCY * (step["concurrency"] / previous["concurrency"] - 1)
+
+
+async def sweep(target, payloads, levels, mode, duration, warmup, slo_ms=None, extra_steps=1):
+    """Run one step per load level until ``extra_steps`` past the saturation point."""
+    await target.start()
+    try:
+        if warmup:
+            await closed_loop(target, payloads, 1, warmup)
+        steps, saturation, previous = [], None, None
+        for level in levels:
+            if mode == "rate":
+                step = await open_loop(target, payloads, level, duration)
+            else:
+                step = await closed_loop(target, payloads, level, duration)
+            step["saturated"] = is_saturated(step, previous, slo_ms)
+            steps.append(step)
+            _print_step(step)
+            if step["saturated"] and saturation is None:
+                saturation = len(steps) - 1
+            if saturation is not None and len(steps) - 1 - saturation >= extra_steps:
+                break
+            previous = step
+        return steps, saturation
+    finally:
+        await target.stop()
+
+
+def _print_step(step):
+    load = f"rate {step['rate']:>8,.0f}/s" if "rate" in step else f"concurrency {step['concurrency']:>4}"
+    print(f"   {load}  {step['throughput']:>9,.1f} req/s   p50 {step['p50_ms']:>8.2f}   "
+          f"p95 {step['p95_ms']:>8.2f}   p99 {step['p99_ms']:>8.2f} ms   errors {step['errors']:>5}"
+          + ("   ⚠️ saturated" if step["saturated"] else ""), flush=True)
+
+
+def plot_curves(steps, mode, path):
+    """Throughput and latency percentiles against the load level."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    key = "rate" if mode == "rate" else "concurrency"
+    levels = [step[key] for step in steps]
+    fig, (ax_throughput, ax_latency) = plt.subplots(1, 2, figsize=(12, 4.5))
+    ax_throughput.plot(levels, [step["throughput"] for step in steps], marker="o")
+    ax_throughput.set_ylabel("Throughput (req/s)")
+    for name in ("p50_ms", "p95_ms", "p99_ms"):
+        ax_latency.plot(levels, [step[name] for step in steps], marker="o", label=name[:3])
+    ax_latency.set_ylabel("Latency (ms)")
+    ax_latency.set_yscale("log")
+    ax_latency.legend()
+    for ax in (ax_throughput, ax_latency):
+        ax.set_xlabel("Offered rate (req/s)" if mode == "rate" else "Concurrent clients")
+        ax.set_xscale("log", base=2)
+        ax.grid(alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(server_args="", timeout=120):
+    """Launch scoring_service.py on a free local port; returns (process, url).
+
+    Metrics, audit logging and drift tracking are always switched off, on top
+    of whatever ``server_args`` asks for. The server gets its own process
+    group, so ``stop_server`` can stop it together with any workers.
+    """
+    port = _free_port()
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_service.py")
+    process = subprocess.Popen([sys.executable, "-W", "ignore", script, "--port", str(port),
+                                *shlex.split(server_args), *_ISOLATED_SERVER_ARGS],
+                               stdout=subprocess.DEVNULL, start_new_session=os.name == "posix")
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"scoring_service.py exited with {process.returncode}")
+        try:
+            urllib.request.urlopen(f"{url}/health", timeout=1).read()
+            return process, url
+        except OSError:
+            time.sleep(0.25)
+    stop_server(process)
+    raise SystemExit("scoring_service.py did not become healthy")
+
+
+def stop_server(process, timeout=15):
+    """SIGTERM the server's whole process group, then SIGKILL whatever outlives ``timeout``."""
+    if os.name != "posix":
+        process.terminate()
+        process.wait()
+        return
+
+    def signal_group(signum):
+        try:
+            os.killpg(process.pid, signum)
+        except ProcessLookupError:
+            pass
+
+    signal_group(signal.SIGTERM)
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        pass
+    # Workers still in the group after the supervisor stopped would keep the port bound
+    signal_group(signal.SIGKILL)
+    process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the fraud scoring path and find its saturation point.")
+    parser.add_argument("--target", choices=("http", "inprocess"), default="http")
+    parser.add_argument("--url", default=DEFAULT_URL, help="running scoring service (http target)")
+    parser.add_argument("--start-server", action="store_true", help="spawn a local scoring_service.py to test")
+    parser.add_argument("--server-args", default="",
+                        help="extra scoring_service.py arguments with --start-server "
+                             "(metrics, audit log and drift are always off)")
+    levels = parser.add_mutually_exclusive_group()
+    levels.add_argument("--concurrency", type=int, nargs="+", help="closed-loop client counts to step through")
+    levels.add_argument("--rates", type=float, nargs="+", help="open-loop arrival rates (req/s) to step through")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of single-client warmup")
+    parser.add_argument("--connections", type=int, default=256, help="keep-alive connections (http target)")
+    parser.add_argument("--slo-ms", type=float, help="p99 latency above this also counts as saturated")
+    parser.add_argument("--extra-steps", type=int, default=1, help="steps to run past the saturation point")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--rows", type=int, default=10_000, help="distinct sampled applications")
+    parser.add_argument("--json", metavar="PATH", help="write every step's results here")
+    parser.add_argument("--plot", metavar="PNG", help="save throughput/latency curves here")
+    args = parser.parse_args(argv)
+
+    mode = "rate" if args.rates else "concurrency"
+    levels = args.rates or args.concurrency or list(DEFAULT_CONCURRENCY)
+    server = None
+    if args.target == "http" and args.start_server:
+        server, args.url = start_server(args.server_args)
+    try:
+        if args.target == "http":
+            target = HttpTarget(args.url, args.connections)
+        else:
+            target = InProcessTarget(max(levels) if mode == "concurrency" else args.connections)
+        payloads = [target.encode(row) for row in sample_rows(args.data, args.rows)]
+        print(f"🚦 Load test against {target.url}: {len(payloads):,} sampled applications, "
+              f"{args.duration:g}s per step, stepping {mode}")
+        steps, saturation = asyncio.run(sweep(target, payloads, levels, mode, args.duration, args.warmup,
+                                              args.slo_ms, args.extra_steps))
+    finally:
+        if server is not None:
+            stop_server(server)
+
+    if saturation is None:
+        print("\n✅ No saturation within the tested range; extend --concurrency / --rates")
+    else:
+        knee = steps[saturation - 1] if saturation else None
+        level = steps[saturation]["rate" if mode == "rate" else "concurrency"]
+        print(f"\n📈 Saturation at {mode} {level:g}"
+              + (f"; capacity ≈ {knee['throughput']:,.0f} req/s with p99 {knee['p99_ms']:.1f} ms" if knee else
+                 "; the first step already saturated, start lower"))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"target": target.url, "mode": mode, "duration_s": args.duration, "steps": steps,
+                       "saturation_step": saturation}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+    if args.plot:
+        plot_curves(steps, mode, args.plot)
+        print(f"📊 Curves saved to {args.plot}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
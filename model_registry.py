@@ -0,0 +1,196 @@
+"""Process-wide registry for the fraud model and scaler artifacts.
+
+The model/scaler pair is deserialized once per process and shared by every
+caller (all Streamlit sessions, scripts, workers). A background thread polls
+the artifact files and, when they change, loads the new pair off the request
+path and swaps it in with a single reference assignment, so readers always see
+a consistent model/scaler pair and never wait on a reload.
+
+Artifacts written by ``train_model.py`` come with a ``model_metadata.json``
+next to the model (feature order, data hash, metrics and the SHA-256 of both
+files). When it is present the files are checked against it on load, so a
+model paired with the wrong scaler, or a half-copied file, is never served.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import joblib
+
+MODEL_PATH = "fraud_detection_model.pkl"
+SCALER_PATH = "scaler.pkl"
+METADATA_FILE = "model_metadata.json"
+
+
+class ArtifactMismatchError(ValueError):
+    """The model/scaler files do not match their training metadata."""
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """An immutable, consistent snapshot of the loaded artifacts."""
+
+    model: object
+    scaler: object
+    version: str
+    loaded_at: float
+    metadata: dict = None
+    # Follows the files' content, so it survives a copy, restore or redeploy (see content_version)
+    content_version: str = None
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def metadata_path_for(model_path):
+    """Where the training metadata for ``model_path`` lives (same directory)."""
+    return os.path.join(os.path.dirname(model_path), METADATA_FILE)
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_metadata(model_path, scaler_path):
+    """Return the verified training metadata for the pair, or None if there is none.
+
+    Raises ArtifactMismatchError when either file's hash differs from the one
+    recorded at training time.
+    """
+    path = metadata_path_for(model_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        metadata = json.load(f)
+    artifacts = metadata.get("artifacts", {})
+    for name, artifact_path in (("model", model_path), ("scaler", scaler_path)):
+        expected = artifacts.get(name, {}).get("sha256")
+        if expected is not None and file_sha256(artifact_path) != expected:
+            raise ArtifactMismatchError(
+                f"{artifact_path} does not match the {name} recorded in {path} "
+                f"(model version {metadata.get('version')})"
+            )
+    return metadata
+
+
+def content_version(metadata, model_path, scaler_path):
+    """The training version from the metadata, else a hash of both artifact files."""
+    if metadata is not None and metadata.get("version"):
+        return metadata["version"]
+    return f"sha256-{file_sha256(model_path)[:16]}-{file_sha256(scaler_path)[:16]}"
+
+
+class ModelRegistry:
+    """Loads the model/scaler pair once and hot-swaps it when the files change."""
+
+    def __init__(self, model_path=MODEL_PATH, scaler_path=SCALER_PATH, poll_interval=2.0):
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.poll_interval = poll_interval
+        self.last_error = None
+        self.reload_count = 0
+        self._bundle = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def _signature_now(self):
+        metadata_path = metadata_path_for(self.model_path)
+        metadata = _file_signature(metadata_path) if os.path.exists(metadata_path) else None
+        return _file_signature(self.model_path), _file_signature(self.scaler_path), metadata
+
+    def _load(self, signature):
+        metadata = load_metadata(self.model_path, self.scaler_path)
+        model = joblib.load(self.model_path)
+        scaler = joblib.load(self.scaler_path)
+        (model_mtime, model_size), (scaler_mtime, scaler_size), _ = signature
+        version = f"{model_mtime:x}-{model_size:x}.{scaler_mtime:x}-{scaler_size:x}"
+        return ModelBundle(model=model, scaler=scaler, version=version, loaded_at=time.time(),
+                           metadata=metadata,
+                           content_version=content_version(metadata, self.model_path, self.scaler_path))
+
+    def get(self):
+        """Return the current bundle, loading it on first use."""
+        bundle = self._bundle
+        if bundle is not None:
+            return bundle
+        with self._lock:
+            if self._bundle is None:
+                signature = self._signature_now()
+                self._bundle = self._load(signature)
+                self._signature = signature
+            return self._bundle
+
+    def reload_if_changed(self):
+        """Reload the artifacts if any file changed; return True on a swap.
+
+        A failed load (e.g. a file caught mid-write, or a model/scaler pair that
+        fails its metadata check while a new version is being published) keeps the current bundle
+        in service and is retried on the next poll.
+        """
+        try:
+            signature = self._signature_now()
+        except OSError as e:
+            self.last_error = e
+            return False
+        if signature == self._signature:
+            return False
+        with self._lock:
+            if signature == self._signature:
+                return False
+            try:
+                bundle = self._load(signature)
+            except Exception as e:
+                self.last_error = e
+                return False
+            # Re-check after loading: if the files moved on while we were
+            # reading them, the pair may be inconsistent; try again next poll.
+            if self._signature_now() != signature:
+                return False
+            self._bundle = bundle
+            self._signature = signature
+            self.last_error = None
+            self.reload_count += 1
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload_if_changed()
+
+    def start(self):
+        """Start the background file watcher (idempotent)."""
+        if self._watcher is None or not self._watcher.is_alive():
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """Return the process-wide registry, creating and starting it on first call."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(model_path, scaler_path).start()
+        return _registry
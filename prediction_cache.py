@@ -0,0 +1,101 @@
+"""Bounded LRU cache of fraud predictions keyed on normalized feature vectors.
+
+Analysts re-score the same application over and over (sidebar presets, slider
+wiggles, reruns after unrelated widget changes). Keys are the 10 raw features
+in FEATURES order, with the float sliders rounded to their widget step so
+float noise does not defeat the cache, plus the model version so a hot-reloaded
+model never serves stale results.
+"""
+
+import threading
+from collections import OrderedDict
+
+from fraud_scorer import FEATURES
+
+# Decimal places kept per feature; None keeps the exact value
+DEFAULT_DECIMALS = {
+    'ltv': 1,
+    'valuation_diff_pct': 2,
+    'ownership_match_score': 2,
+    'ocr_confidence': 2,
+}
+
+
+class PredictionCache:
+    """Thread-safe LRU map from (model version, normalized features) to a prediction."""
+
+    def __init__(self, maxsize=4096, decimals=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        decimals = DEFAULT_DECIMALS if decimals is None else decimals
+        unknown = set(decimals) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"unknown features in decimals: {', '.join(sorted(unknown))}")
+        self.maxsize = maxsize
+        self._decimals = [decimals.get(name) for name in FEATURES]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def normalize(self, row):
+        """Return the features as a tuple of floats rounded per feature."""
+        if len(row) != len(FEATURES):
+            raise ValueError(f"expected {len(FEATURES)} features, got {len(row)}")
+        return tuple(float(value) if places is None else round(float(value), places)
+                     for value, places in zip(row, self._decimals))
+
+    def key(self, row, model_version=None):
+        return model_version, self.normalize(row)
+
+    def get(self, key):
+        """Return the cached value for key (refreshing its recency) or None."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, row, compute, model_version=None):
+        """Return compute(normalized_row) through the cache.
+
+        The value is computed on the normalized row, so every row that maps
+        to a key gets exactly the prediction stored for it.
+        """
+        key = self.key(row, model_version)
+        value = self.get(key)
+        if value is None:
+            value = compute(key[1])
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,168 @@
+"""Declarative, vectorized heuristic risk rules.
+
+The "Real-time Risk Assessment" score and the "Live Risk Meter" used to be
+if/elif chains over the on-screen widget values. Here they are data: each
+rule is a feature plus ordered bands (first match wins), each meter term is
+a clipped linear contribution. Both evaluate over whole NumPy/pandas columns,
+so the same numbers can be produced for one application or millions of rows.
+
+Inputs are any mapping of FEATURES names to scalars or 1-D arrays (a dict, a
+DataFrame, a row Series).
+"""
+
+import operator
+from dataclasses import dataclass
+
+import numpy as np
+
+_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+@dataclass(frozen=True)
+class Band:
+    op: str
+    threshold: float
+    label: str
+    points: int
+
+
+@dataclass(frozen=True)
+class Rule:
+    feature: str
+    bands: tuple
+    absolute: bool = False
+
+
+@dataclass(frozen=True)
+class MeterTerm:
+    """Contribution ``clip((x - origin) * weight, floor, cap)``, applied where ``x > 0`` if ``positive_only``."""
+
+    feature: str
+    weight: float
+    origin: float = 0.0
+    floor: float = None
+    cap: float = None
+    positive_only: bool = False
+
+
+RISK_RULES = (
+    Rule('ltv', (
+        Band('>', 90, "🔴 Extremely High LTV", 30),
+        Band('>', 80, "🟠 High LTV", 20),
+        Band('>', 60, "🟡 Moderate LTV", 10),
+    )),
+    Rule('credit_score', (
+        Band('<', 600, "🔴 Very Poor Credit", 25),
+        Band('<', 650, "🟠 Poor Credit", 15),
+        Band('<', 700, "🟡 Fair Credit", 5),
+    )),
+    Rule('ocr_confidence', (
+        Band('<', 0.7, "🔴 Poor Document Quality", 20),
+        Band('<', 0.9, "🟡 Moderate Document Quality", 10),
+    )),
+    Rule('valuation_diff_pct', (
+        Band('>', 15, "🔴 Significant Valuation Issue", 15),
+        Band('>', 5, "🟡 Minor Valuation Concern", 8),
+    ), absolute=True),
+    Rule('num_prev_mortgages', (
+        Band('>', 3, "🟠 Multiple Previous Mortgages", 10),
+    )),
+)
+
+# (upper bound inclusive, label) for the risk score; the first bound that fits wins
+RISK_SCORE_BANDS = (
+    (0, "Excellent"),
+    (20, "Low"),
+    (50, "Moderate"),
+    (np.inf, "High"),
+)
+
+METER_TERMS = (
+    MeterTerm('ltv', 0.8, cap=60, positive_only=True),
+    MeterTerm('credit_score', -0.15, origin=750, floor=0, positive_only=True),
+    MeterTerm('ocr_confidence', -30, origin=1),
+)
+METER_CAP = 100
+
+# (lower bound exclusive, colour) for the meter; the first bound exceeded wins
+METER_COLORS = (
+    (75, "#ff0000"),
+    (50, "#ffaa00"),
+    (25, "#ffff00"),
+    (-np.inf, "#00ff00"),
+)
+
+
+def _column(data, feature):
+    return np.atleast_1d(np.asarray(data[feature], dtype=np.float64))
+
+
+class RuleResult:
+    """Vectorized outcome of the rules: one score and one band per rule for every row."""
+
+    def __init__(self, rules, score, band_index):
+        self.rules = rules
+        self.score = score
+        # (rows, rules) index into each rule's bands, -1 where no band matched
+        self.band_index = band_index
+
+    def __len__(self):
+        return len(self.score)
+
+    def factors(self, row):
+        """Labels of the triggered factors for one row, in rule order."""
+        return [rule.bands[band].label
+                for rule, band in zip(self.rules, self.band_index[row]) if band >= 0]
+
+    def factor_lists(self):
+        """Triggered factor labels for every row."""
+        labels = [np.array([band.label for band in rule.bands] + [""], dtype=object) for rule in self.rules]
+        # Index -1 picks the trailing "" for rules that did not fire
+        per_rule = [labels[j][self.band_index[:, j]] for j in range(len(self.rules))]
+        return [[label for label in row if label] for row in zip(*per_rule)]
+
+    def score_band(self):
+        return risk_score_band(self.score)
+
+
+def evaluate_rules(data, rules=RISK_RULES):
+    """Evaluate the banded rules over every row of ``data``."""
+    columns = []
+    scores = None
+    for rule in rules:
+        x = _column(data, rule.feature)
+        if rule.absolute:
+            x = np.abs(x)
+        conditions = [_OPS[band.op](x, band.threshold) for band in rule.bands]
+        band_index = np.select(conditions, np.arange(len(rule.bands)), default=-1)
+        points = np.select(conditions, [band.points for band in rule.bands], default=0)
+        columns.append(band_index)
+        scores = points if scores is None else scores + points
+    return RuleResult(rules, scores, np.stack(columns, axis=1).astype(np.int8))
+
+
+def risk_score_band(score):
+    """Band label per score (Excellent/Low/Moderate/High)."""
+    score = np.atleast_1d(np.asarray(score))
+    return np.select([score <= bound for bound, _ in RISK_SCORE_BANDS],
+                     [label for _, label in RISK_SCORE_BANDS], default=RISK_SCORE_BANDS[-1][1])
+
+
+def meter_risk(data, terms=METER_TERMS, cap=METER_CAP):
+    """Live risk meter value (0-cap) per row."""
+    total = None
+    for term in terms:
+        x = _column(data, term.feature)
+        contribution = (x - term.origin) * term.weight
+        if term.floor is not None or term.cap is not None:
+            contribution = np.clip(contribution, term.floor, term.cap)
+        if term.positive_only:
+            contribution = np.where(x > 0, contribution, 0.0)
+        total = contribution if total is None else total + contribution
+    return np.minimum(total, cap)
+
+
+def meter_color(risk):
+    risk = np.atleast_1d(np.asarray(risk))
+    return np.select([risk > bound for bound, _ in METER_COLORS],
+                     [color for _, color in METER_COLORS], default=METER_COLORS[-1][1])
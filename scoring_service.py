@@ -0,0 +1,534 @@
+"""Local asyncio HTTP scoring service with dynamic micro-batching.
+
+Concurrent single-application requests are queued and merged into one
+``predict_proba`` call, bounded by ``max_batch_size`` rows and ``max_wait``
+seconds after the first queued request. The forest's per-call overhead is then
+paid once per batch instead of once per request.
+
+    python scoring_service.py --port 8765 --max-batch-size 64 --max-wait-ms 2
+    python scoring_service.py --port 8765 --workers 4
+
+With ``--workers N`` a small supervisor compiles the model/scaler pair into the
+flat ``fraud_forest.bin`` format (see compiled_forest.py) and starts N worker
+processes that memory-map it read-only and share the port (SO_REUSEPORT). The
+forest's pages then exist once per host, in the page cache, however many
+workers there are; each worker only adds its interpreter. The supervisor
+recompiles the file when the model files change (workers remap it within a
+couple of seconds) and prints RSS/PSS per worker; ``/stats`` reports the same
+for the worker that answers. Drift is tracked per worker.
+
+Endpoints:
+    POST /score   {"loan_amount": ..., ..., "income": ...}  (or {"features": [10 values]})
+    GET  /health
+    GET  /stats
+    GET  /drift   feature/score drift against the training reference
+
+Every decision is appended to the audit log (audit_log.py) unless
+``--audit-dir ''`` is given; the writer thread group-commits off the request path.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from audit_log import AUDIT_DIR, AuditLog, decision_records
+from compiled_forest import COMPILED_PATH, CompiledForest, compile_forest
+from drift_monitor import DriftMonitor, DriftReference, reference_path_for
+from fraud_scorer import FEATURES, FraudScorer
+from live_metrics import METRICS_DB, LiveMetrics
+from model_registry import MODEL_PATH, SCALER_PATH, ModelBundle, ModelRegistry, file_sha256
+
+MAX_BODY_BYTES = 1 << 20
+
+# smaps fields summed by memory_usage, in kB
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+def memory_usage(pid="self", mapped_path=None):
+    """RSS, PSS, shared and private MB of a process (Linux only; None elsewhere).
+
+    With ``mapped_path``, ``mapped_rss_mb`` is how much of that file's mapping is
+    resident, including a mapping of a file since replaced on disk.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    target = os.path.realpath(mapped_path) if mapped_path else None
+    totals = defaultdict(int)
+    in_target = False
+    for line in lines:
+        fields = line.split()
+        if not fields:
+            continue
+        if not fields[0].endswith(":"):
+            # Mapping header: address perms offset dev inode [path]
+            in_target = target is not None and len(fields) > 5 and fields[5] == target
+            continue
+        key = fields[0][:-1]
+        if key in _SMAPS_FIELDS:
+            totals[key] += int(fields[1])
+            if key == "Rss" and in_target:
+                totals["mapped"] += int(fields[1])
+    usage = {
+        "rss_mb": totals["Rss"] / 1024,
+        "pss_mb": totals["Pss"] / 1024,
+        "shared_mb": (totals["Shared_Clean"] + totals["Shared_Dirty"]) / 1024,
+        "private_mb": (totals["Private_Clean"] + totals["Private_Dirty"]) / 1024,
+    }
+    if target is not None:
+        usage["mapped_rss_mb"] = totals["mapped"] / 1024
+    return usage
+
+
+class SharedForest:
+    """Registry stand-in for worker processes: the compiled forest, mapped read-only.
+
+    ``get`` returns a ModelBundle whose model is the mapped CompiledForest. The
+    file is re-checked at most every ``poll_interval`` seconds and remapped when
+    the supervisor has replaced it.
+    """
+
+    def __init__(self, path=COMPILED_PATH, poll_interval=2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._bundle = None
+        self._signature = None
+        self._checked = 0.0
+
+    def get(self):
+        now = time.monotonic()
+        if self._bundle is None or now - self._checked >= self.poll_interval:
+            self._checked = now
+            stat = os.stat(self.path)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                forest = CompiledForest.load(self.path)
+                self._bundle = ModelBundle(model=forest, scaler=None, version=forest.source.get("version", ""),
+                                           loaded_at=time.time(), metadata=None,
+                                           content_version=forest.source.get("content_version"))
+                self._signature = signature
+        return self._bundle
+
+
+def _forest_scorer(bundle):
+    return bundle.model
+
+
+class MicroBatcher:
+    """Coalesces concurrent score requests into batched predict_proba calls."""
+
+    def __init__(self, registry, max_batch_size=64, max_wait=0.002, metrics=None, drift=None,
+                 make_scorer=FraudScorer.from_bundle, audit=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.registry = registry
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self.drift = drift
+        self.make_scorer = make_scorer
+        self.audit = audit
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+        self._scorer = None
+        self._queue = None
+        self._task = None
+
+    def _current_scorer(self):
+        bundle = self.registry.get()
+        if self._scorer is None or self._scorer[0] != bundle.version:
+            self._scorer = (bundle.version, self.make_scorer(bundle), bundle.content_version)
+        return self._scorer
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def score(self, row):
+        """Queue one raw feature row and wait for its (probability, prediction, version)."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _score_batch(self, rows):
+        version, scorer, content_version = self._current_scorer()
+        X = np.vstack(rows)
+        probabilities, predictions = scorer.score_batch(X)
+        if self.metrics is not None:
+            self.metrics.record_many(probabilities, predictions)
+        if self.drift is not None:
+            self.drift.update(X, probabilities)
+        if self.audit is not None:
+            self.audit.append_many(decision_records(X, scorer.transform(X), probabilities, predictions,
+                                                    content_version, source="service"))
+        return version, probabilities, predictions
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests whose client went away are dropped before scoring
+            batch = [(row, future) for row, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                version, probabilities, predictions = await loop.run_in_executor(
+                    None, self._score_batch, [row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, future), probability, prediction in zip(batch, probabilities, predictions):
+                if not future.done():
+                    future.set_result((float(probability), int(prediction), version))
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "pid": os.getpid(),
+            "memory": memory_usage(mapped_path=getattr(self.registry, "path", None)),
+            "audit": self.audit.stats() if self.audit is not None else None,
+        }
+
+
+def parse_application(payload):
+    """Turn a JSON request body into a (10,) float64 row in FEATURES order."""
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+    if "features" in payload:
+        values = payload["features"]
+        if not isinstance(values, list) or len(values) != len(FEATURES):
+            raise ValueError(f"'features' must be a list of {len(FEATURES)} numbers")
+    else:
+        missing = [c for c in FEATURES if c not in payload]
+        if missing:
+            raise ValueError(f"missing required fields: {', '.join(missing)}")
+        values = [payload[c] for c in FEATURES]
+    try:
+        row = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("feature values must be numbers") from None
+    if not np.all(np.isfinite(row)):
+        raise ValueError("feature values must be finite")
+    return row
+
+
+class ScoringService:
+    """Minimal HTTP/1.1 front end (keep-alive, JSON bodies) over a MicroBatcher."""
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.started_at = time.time()
+
+    async def _respond(self, writer, status, body, keep_alive):
+        data = json.dumps(body).encode()
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode() + data)
+        await writer.drain()
+
+    async def _dispatch(self, method, path, body):
+        if path == "/score":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                row = parse_application(json.loads(body or b"null"))
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            try:
+                probability, prediction, version = await self.batcher.score(row)
+            except Exception as e:
+                return 503, {"error": f"scoring failed: {e}"}
+            return 200, {"fraud_probability": probability, "prediction": prediction,
+                         "model_version": version}
+        if path == "/health":
+            return 200, {"status": "ok", "uptime_s": time.time() - self.started_at}
+        if path == "/stats":
+            return 200, self.batcher.stats()
+        if path == "/drift":
+            if self.batcher.drift is None:
+                return 404, {"error": "drift monitoring is off (no drift reference)"}
+            return 200, {"rows": self.batcher.drift.rows, "columns": self.batcher.drift.report()}
+        return 404, {"error": f"unknown path {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self._dispatch(method, path.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, registry, max_batch_size, max_wait, metrics=None, ready=None, drift=None,
+                make_scorer=FraudScorer.from_bundle, reuse_port=False, audit=None):
+    batcher = MicroBatcher(registry, max_batch_size=max_batch_size, max_wait=max_wait, metrics=metrics,
+                           drift=drift, make_scorer=make_scorer, audit=audit)
+    batcher.start()
+    service = ScoringService(batcher)
+    server = await asyncio.start_server(service.handle, host, port, backlog=1024,
+                                        reuse_port=reuse_port or None)
+    print(f"🛡️ Scoring service on http://{host}:{port} "
+          f"(max batch {max_batch_size}, max wait {max_wait * 1000:.1f} ms, pid {os.getpid()})")
+    if ready is not None:
+        ready.set()
+    if os.name == "posix":
+        # SIGTERM (systemd, Docker, the worker supervisor) shuts down like Ctrl-C:
+        # the batcher drains and the audit log is closed below
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+        if audit is not None:
+            audit.close()
+
+
+def _load_drift(model_path, drift_reference):
+    reference_path = reference_path_for(model_path) if drift_reference is None else drift_reference
+    if reference_path and os.path.exists(reference_path):
+        return DriftMonitor(DriftReference.load(reference_path))
+    return None
+
+
+def _compile_shared_forest(model_path, scaler_path, forest_path):
+    # Runs in a short-lived process, so the supervisor never holds the sklearn forest
+    bundle = ModelRegistry(model_path, scaler_path).get()
+    source = {"version": bundle.version, "content_version": bundle.content_version,
+              "model_sha256": file_sha256(model_path), "scaler_sha256": file_sha256(scaler_path)}
+    compile_forest(bundle.model, bundle.scaler, source=source).save(forest_path)
+
+
+def _exit_with_parent(parent_pid, interval=1.0):
+    # A worker whose supervisor died (even by SIGKILL) must not keep serving on the port
+    while os.getppid() == parent_pid:
+        time.sleep(interval)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def _run_worker(host, port, forest_path, max_batch_size, max_wait, metrics_db, model_path, drift_reference,
+                audit_dir, ready):
+    threading.Thread(target=_exit_with_parent, args=(os.getppid(),), name="parent-watch", daemon=True).start()
+    registry = SharedForest(forest_path)
+    registry.get()
+    metrics = LiveMetrics(metrics_db) if metrics_db else None
+    drift = _load_drift(model_path, drift_reference)
+    audit = AuditLog(audit_dir) if audit_dir else None
+    try:
+        asyncio.run(serve(host, port, registry, max_batch_size, max_wait, metrics=metrics, ready=ready,
+                          drift=drift, make_scorer=_forest_scorer, reuse_port=True, audit=audit))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+def _artifact_signature(model_path, scaler_path):
+    return tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in (model_path, scaler_path))
+
+
+def print_memory(workers, forest_path):
+    """One line per worker plus the total PSS, the node's real cost of the pool."""
+    print(f"🧠 Memory per worker (forest file {os.path.getsize(forest_path) / 1e6:.1f} MB, mapped shared)")
+    total_pss = 0.0
+    for worker in workers:
+        usage = memory_usage(worker.pid, forest_path)
+        if usage is None:
+            print("   (per-process memory needs Linux /proc)")
+            return
+        total_pss += usage["pss_mb"]
+        print(f"   pid {worker.pid:<8} RSS {usage['rss_mb']:7.1f} MB   PSS {usage['pss_mb']:7.1f} MB   "
+              f"private {usage['private_mb']:7.1f} MB   forest resident {usage['mapped_rss_mb']:6.1f} MB")
+    print(f"   total PSS {total_pss:.1f} MB for {len(workers)} workers")
+
+
+def serve_workers(args):
+    """Supervise ``args.workers`` processes serving one memory-mapped forest.
+
+    SIGTERM (or Ctrl-C) stops the workers with the supervisor; a worker whose
+    supervisor is gone exits on its own.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise SystemExit("--workers needs SO_REUSEPORT (Linux, macOS or BSD)")
+    # spawn, not fork: workers start from a clean interpreter and never import sklearn
+    context = multiprocessing.get_context("spawn")
+    # Process managers stop services with SIGTERM; exit normally so the workers are stopped below
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    def compile_forest_file():
+        compiler = context.Process(target=_compile_shared_forest,
+                                   args=(args.model, args.scaler, args.forest), name="forest-compiler")
+        compiler.start()
+        compiler.join()
+        return compiler.exitcode == 0
+
+    signature = _artifact_signature(args.model, args.scaler)
+    print(f"🔧 Compiling {args.model} / {args.scaler} into {args.forest}...")
+    if not compile_forest_file():
+        raise SystemExit("could not compile the model into a shared forest")
+
+    def start_worker():
+        ready = context.Event()
+        worker = context.Process(target=_run_worker, name="scoring-worker", daemon=True,
+                                 args=(args.host, args.port, args.forest, args.max_batch_size,
+                                       args.max_wait_ms / 1000, args.metrics_db, args.model, args.drift_reference,
+                                       args.audit_dir, ready))
+        worker.start()
+        return worker, ready
+
+    started = [start_worker() for _ in range(args.workers)]
+    for worker, ready in started:
+        if not ready.wait(60):
+            raise SystemExit(f"worker {worker.pid} did not start")
+    workers = [worker for worker, _ in started]
+    print_memory(workers, args.forest)
+
+    last_report = time.monotonic()
+    try:
+        while True:
+            time.sleep(2.0)
+            for i, worker in enumerate(workers):
+                if not worker.is_alive():
+                    print(f"⚠️ Worker {worker.pid} exited ({worker.exitcode}); restarting")
+                    workers[i], _ = start_worker()
+            try:
+                current = _artifact_signature(args.model, args.scaler)
+            except OSError:
+                continue
+            if current != signature and compile_forest_file():
+                # A failed compile (e.g. a half-published pair) is retried on the next poll
+                signature = current
+                print(f"🔄 Model files changed; recompiled {args.forest}")
+            if args.memory_report_s and time.monotonic() - last_report >= args.memory_report_s:
+                print_memory(workers, args.forest)
+                last_report = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join(10)
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve fraud scores over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--max-batch-size", type=int, default=64, help="most requests merged into one predict call")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="longest a request waits for batch-mates")
+    parser.add_argument("--metrics-db", default=METRICS_DB, help="shared live metrics database ('' to disable)")
+    parser.add_argument("--drift-reference", default=None,
+                        help="training drift reference (default: next to the model; '' to disable)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="worker processes sharing one memory-mapped forest (0 = single process)")
+    parser.add_argument("--forest", default=COMPILED_PATH, help="compiled forest file used with --workers")
+    parser.add_argument("--memory-report-s", type=float, default=60.0,
+                        help="how often the supervisor prints per-worker memory (0 = only at start)")
+    parser.add_argument("--audit-dir", default=AUDIT_DIR, help="decision audit log directory ('' to disable)")
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        serve_workers(args)
+        return
+
+    registry = ModelRegistry(args.model, args.scaler).start()
+    registry.get()
+    metrics = LiveMetrics(args.metrics_db) if args.metrics_db else None
+    drift = _load_drift(args.model, args.drift_reference)
+    audit = AuditLog(args.audit_dir) if args.audit_dir else None
+    try:
+        asyncio.run(serve(args.host, args.port, registry, args.max_batch_size, args.max_wait_ms / 1000,
+                          metrics=metrics, drift=drift, audit=audit))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        registry.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Chunked, parallel and cached SHAP values for offline reports.
+
+``TreeExplainer.shap_values`` over the whole test set is single-threaded and
+by far the slowest step of the reports. Here rows are split into chunks that
+worker processes explain in parallel (each worker builds its explainer once),
+optionally on a reproducible row sample. The fraud-class values are written to
+a ``.npy`` file keyed on a hash of the model and the data, and returned
+memory-mapped, so later plots and reports reuse them instantly.
+
+    from shap_cache import cached_shap_values
+    values, rows = cached_shap_values(model, X_test_s, sample=2000)
+"""
+
+import contextlib
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SHAP_CACHE_DIR = ".shap_cache"
+
+_worker_explainer = None
+_worker_fraud_index = None
+
+
+def fraud_class_values(values, fraud_index):
+    """Reduce any shap_values() layout to an (n_rows, n_features) fraud-class array."""
+    if isinstance(values, list):
+        return np.asarray(values[fraud_index])
+    values = np.asarray(values)
+    if values.ndim == 3:
+        return values[:, :, fraud_index]
+    return values
+
+
+def _init_worker(model_bytes):
+    global _worker_explainer, _worker_fraud_index
+    import shap
+    model = pickle.loads(model_bytes)
+    _worker_explainer = shap.TreeExplainer(model)
+    _worker_fraud_index = list(model.classes_).index(1)
+
+
+def _explain_chunk(rows):
+    values = _worker_explainer.shap_values(rows, check_additivity=False)
+    return fraud_class_values(values, _worker_fraud_index)
+
+
+def data_digest(X):
+    X = np.ascontiguousarray(X)
+    digest = hashlib.sha256(f"{X.dtype.str}{X.shape}".encode())
+    digest.update(X.tobytes())
+    return digest.hexdigest()
+
+
+def sample_rows(n_rows, sample=None, random_state=42):
+    """Sorted row indices of a reproducible sample (all rows when sample is None)."""
+    if sample is None or sample >= n_rows:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(random_state)
+    return np.sort(rng.choice(n_rows, size=sample, replace=False))
+
+
+def cached_shap_values(model, X, sample=None, random_state=42, chunk_rows=256, jobs=None,
+                       cache_dir=SHAP_CACHE_DIR, model_key=None):
+    """Fraud-class SHAP values for the rows of ``X`` (or a sample of them).
+
+    Returns ``(values, rows)``: a read-only memory-mapped (len(rows),
+    n_features) array and the row indices of ``X`` it covers. ``model_key``
+    can be passed (e.g. an artifact file hash) to skip hashing the model.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    rows = sample_rows(len(X), sample, random_state)
+    model_bytes = None
+    if model_key is None:
+        model_bytes = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        model_key = hashlib.sha256(model_bytes).hexdigest()
+    key = hashlib.sha256(
+        f"{model_key}:{data_digest(X)}:{sample}:{random_state}".encode()
+    ).hexdigest()[:32]
+    path = os.path.join(cache_dir, f"shap-{key}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r"), rows
+
+    os.makedirs(cache_dir, exist_ok=True)
+    subset = X[rows]
+    if model_bytes is None:
+        model_bytes = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        _explain_into(tmp_path, subset, model_bytes, chunk_rows, jobs)
+    except BaseException:
+        # The temp file may never have been created; keep the original error
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    # Publish atomically so a concurrent reader never maps a half-written file
+    os.replace(tmp_path, path)
+    return np.load(path, mmap_mode="r"), rows
+
+
+def _explain_into(path, X, model_bytes, chunk_rows, jobs):
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=X.shape)
+    starts = range(0, len(X), chunk_rows)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(model_bytes,)) as pool:
+        for start, values in zip(starts, pool.map(_explain_chunk, (X[s:s + chunk_rows] for s in starts))):
+            out[start:start + len(values)] = values
+    out.flush()
@@ -0,0 +1,156 @@
+"""Startup profiler: import time per module and load time per artifact.
+
+Imports are measured in a fresh interpreter, in the order a script imports
+them, so each line is charged what it actually costs at startup (a module
+already pulled in by an earlier line is free). ``-X importtime`` output from
+the same run is folded into a per-package breakdown, which shows what a slow
+line drags in. Artifact loads (and the sklearn import only they need) are
+timed separately, in this process.
+
+    python startup_profile.py                         # streamlit_app.py's imports + artifacts
+    python startup_profile.py --script scoring_service.py
+    python startup_profile.py --modules shap sklearn.ensemble --json
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Times each module's import in order and prints {module: seconds} as JSON
+_IMPORT_PROBE = """
+import importlib, json, sys, time
+sys.path.insert(0, {here!r})
+timings = {{}}
+for name in {modules!r}:
+    started = time.perf_counter()
+    importlib.import_module(name)
+    timings[name] = time.perf_counter() - started
+print(json.dumps(timings))
+"""
+
+
+def script_imports(path):
+    """Modules a script imports at module level, in source order (lazy imports excluded)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name for name in names if name not in modules)
+    return modules
+
+
+def _parse_importtime(stderr):
+    """Self time per top-level package (seconds) from ``-X importtime`` output."""
+    packages = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            packages[name.split(".")[0]] += int(self_us) / 1e6
+        except ValueError:
+            continue
+    return dict(packages)
+
+
+def import_profile(modules):
+    """(seconds per requested module, self seconds per package) in a fresh interpreter."""
+    code = _IMPORT_PROBE.format(here=_HERE, modules=list(modules))
+    result = subprocess.run([sys.executable, "-W", "ignore", "-X", "importtime", "-c", code],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import failed:\n{result.stderr.strip().splitlines()[-1]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), _parse_importtime(result.stderr)
+
+
+def artifact_profile(model_path, scaler_path, data_path):
+    """Seconds to load each artifact that exists.
+
+    sklearn is only imported when the pickles are loaded; that import is timed
+    as its own line so the pickle lines show just the unpickling.
+    """
+    import importlib
+
+    import joblib
+
+    from compiled_forest import COMPILED_PATH, CompiledForest
+    from drift_monitor import DriftReference, reference_path_for
+    from fraud_dataset import load_dataset
+    from model_registry import load_metadata, metadata_path_for
+
+    loads = {
+        "sklearn (imported to unpickle)": (model_path, lambda: [importlib.import_module(name) for name in
+                                                                ("sklearn.ensemble", "sklearn.preprocessing")]),
+        f"joblib.load({model_path})": (model_path, lambda: joblib.load(model_path)),
+        f"joblib.load({scaler_path})": (scaler_path, lambda: joblib.load(scaler_path)),
+        "metadata + hash verification": (metadata_path_for(model_path),
+                                         lambda: load_metadata(model_path, scaler_path)),
+        "drift reference": (reference_path_for(model_path),
+                            lambda: DriftReference.load(reference_path_for(model_path))),
+        "compiled forest (mmap)": (COMPILED_PATH, lambda: CompiledForest.load(COMPILED_PATH)),
+        "dataset (Parquet cache or CSV)": (data_path, lambda: load_dataset(data_path)),
+    }
+    timings = {}
+    for name, (path, load) in loads.items():
+        if not os.path.exists(path):
+            continue
+        started = time.perf_counter()
+        load()
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def main(argv=None):
+    from fraud_dataset import DATA_PATH
+    from model_registry import MODEL_PATH, SCALER_PATH
+
+    parser = argparse.ArgumentParser(description="Profile import and artifact-load time at startup.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--script", default=os.path.join(_HERE, "streamlit_app.py"),
+                        help="profile this script's imports (default: streamlit_app.py)")
+    target.add_argument("--modules", nargs="+", help="profile these modules instead, in order")
+    parser.add_argument("--top", type=int, default=15, help="packages shown in the breakdown")
+    parser.add_argument("--no-artifacts", action="store_true", help="skip artifact load timings")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--json", action="store_true", help="print the profile as JSON")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or script_imports(args.script)
+    imports, packages = import_profile(modules)
+    artifacts = {} if args.no_artifacts else artifact_profile(args.model, args.scaler, args.data)
+    if args.json:
+        json.dump({"imports": imports, "packages": packages, "artifacts": artifacts}, sys.stdout, indent=2)
+        print()
+        return 0
+
+    total_imports = sum(imports.values())
+    print(f"📦 Imports in order ({total_imports * 1e3:.0f} ms total)")
+    for name, seconds in imports.items():
+        print(f"   {name:<36} {seconds * 1e3:>9.1f} ms")
+    print(f"\n🔬 Self time by package (top {args.top})")
+    for name, seconds in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"   {name:<36} {seconds * 1e3:>9.1f} ms")
+    if artifacts:
+        print(f"\n💾 Artifact loads ({sum(artifacts.values()) * 1e3:.0f} ms total)")
+        for name, seconds in artifacts.items():
+            print(f"   {name:<36} {seconds * 1e3:>9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
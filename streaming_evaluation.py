@@ -0,0 +1,203 @@
+"""Out-of-core model evaluation with mergeable accumulators.
+
+Labeled data is read and scored chunk by chunk; each chunk only updates a
+few fixed-size accumulators:
+
+* confusion counts, from which accuracy and the per-class classification
+  report are exact;
+* per-class histograms of the fraud probability, from which the ROC curve and
+  AUC are computed. Bins whose scores are all equal are exact; the reported
+  ``auc_error_bound`` covers the remaining ones (it is 0 for the forest's
+  probabilities at the default resolution);
+* per-feature count, mean, variance, min and max (Chan's parallel update).
+
+Accumulators from different chunks, files or machines merge losslessly, so
+years of applications can be evaluated shard by shard and combined:
+
+    python streaming_evaluation.py 2023.parquet --save 2023.npz
+    python streaming_evaluation.py 2024.parquet --save 2024.npz
+    python streaming_evaluation.py --merge 2023.npz 2024.npz
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from fraud_dataset import DEFAULT_BATCH_ROWS, iter_batches
+from fraud_scorer import FEATURES, FraudScorer
+from model_registry import MODEL_PATH, SCALER_PATH
+
+DEFAULT_BINS = 1 << 14
+LABEL = "isFraud"
+
+
+class EvaluationAccumulator:
+    """Confusion counts, score histograms and feature moments for a binary model."""
+
+    ARRAYS = ("confusion", "histogram", "bin_min", "bin_max",
+              "feature_count", "feature_mean", "feature_m2", "feature_min", "feature_max")
+
+    def __init__(self, n_bins=DEFAULT_BINS, n_features=len(FEATURES)):
+        self.n_bins = n_bins
+        self.confusion = np.zeros((2, 2), dtype=np.int64)           # [actual, predicted]
+        self.histogram = np.zeros((2, n_bins), dtype=np.int64)       # [actual, score bin]
+        self.bin_min = np.full(n_bins, np.inf)
+        self.bin_max = np.full(n_bins, -np.inf)
+        self.feature_count = np.zeros(n_features, dtype=np.int64)
+        self.feature_mean = np.zeros(n_features)
+        self.feature_m2 = np.zeros(n_features)
+        self.feature_min = np.full(n_features, np.inf)
+        self.feature_max = np.full(n_features, -np.inf)
+
+    @property
+    def rows(self):
+        return int(self.confusion.sum())
+
+    def update(self, y_true, probabilities, predictions, X=None):
+        """Add one scored chunk (labels 0/1, fraud probabilities, predicted labels)."""
+        y_true = np.asarray(y_true).astype(np.int64)
+        predictions = np.asarray(predictions).astype(np.int64)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if y_true.size and (y_true.min() < 0 or y_true.max() > 1):
+            raise ValueError("labels must be 0 or 1")
+        np.add.at(self.confusion, (y_true, predictions), 1)
+
+        bins = np.minimum((probabilities * self.n_bins).astype(np.int64), self.n_bins - 1)
+        np.add.at(self.histogram, (y_true, bins), 1)
+        np.minimum.at(self.bin_min, bins, probabilities)
+        np.maximum.at(self.bin_max, bins, probabilities)
+
+        if X is not None and len(X):
+            X = np.asarray(X, dtype=np.float64)
+            count = np.count_nonzero(~np.isnan(X), axis=0)
+            mean = np.nansum(X, axis=0) / np.maximum(count, 1)
+            m2 = np.nansum((X - mean) ** 2, axis=0)
+            self._merge_moments(count, mean, m2)
+            np.fmin(self.feature_min, np.nanmin(X, axis=0), out=self.feature_min)
+            np.fmax(self.feature_max, np.nanmax(X, axis=0), out=self.feature_max)
+        return self
+
+    def _merge_moments(self, count, mean, m2):
+        total = self.feature_count + count
+        safe = np.maximum(total, 1)
+        delta = mean - self.feature_mean
+        self.feature_m2 = self.feature_m2 + m2 + delta ** 2 * self.feature_count * count / safe
+        self.feature_mean = self.feature_mean + delta * count / safe
+        self.feature_count = total
+
+    def merge(self, other):
+        """Fold another accumulator (same bins and features) into this one."""
+        if other.n_bins != self.n_bins or other.feature_count.shape != self.feature_count.shape:
+            raise ValueError("accumulators have different bins or features")
+        self.confusion += other.confusion
+        self.histogram += other.histogram
+        np.minimum(self.bin_min, other.bin_min, out=self.bin_min)
+        np.maximum(self.bin_max, other.bin_max, out=self.bin_max)
+        self._merge_moments(other.feature_count, other.feature_mean, other.feature_m2)
+        np.fmin(self.feature_min, other.feature_min, out=self.feature_min)
+        np.fmax(self.feature_max, other.feature_max, out=self.feature_max)
+        return self
+
+    def roc_curve(self):
+        """(fpr, tpr, thresholds) from the highest score bin down, starting at (0, 0)."""
+        occupied = np.flatnonzero(self.histogram.sum(axis=0))[::-1]
+        negatives, positives = self.histogram[:, occupied]
+        fpr = np.concatenate([[0.0], np.cumsum(negatives) / max(negatives.sum(), 1)])
+        tpr = np.concatenate([[0.0], np.cumsum(positives) / max(positives.sum(), 1)])
+        thresholds = np.concatenate([[np.inf], self.bin_min[occupied]])
+        return fpr, tpr, thresholds
+
+    def roc_auc(self):
+        """(AUC, bound on its absolute error from bins holding several distinct scores)."""
+        negatives, positives = self.histogram.astype(np.float64)
+        pairs = positives.sum() * negatives.sum()
+        if pairs == 0:
+            return float("nan"), 0.0
+        below = np.cumsum(negatives) - negatives
+        auc = (positives * (below + 0.5 * negatives)).sum() / pairs
+        mixed = self.bin_min < self.bin_max
+        bound = 0.5 * (positives[mixed] * negatives[mixed]).sum() / pairs
+        return float(auc), float(bound)
+
+    def report(self):
+        """Metrics as a JSON-friendly dict."""
+        tn, fp, fn, tp = self.confusion.ravel().tolist()
+        rows = tn + fp + fn + tp
+        classes = {}
+        for label, (hit, false_pos, false_neg) in (("0", (tn, fn, fp)), ("1", (tp, fp, fn))):
+            precision = hit / (hit + false_pos) if hit + false_pos else 0.0
+            recall = hit / (hit + false_neg) if hit + false_neg else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            classes[label] = {"precision": precision, "recall": recall, "f1-score": f1,
+                              "support": hit + false_neg}
+        auc, bound = self.roc_auc()
+        count = np.maximum(self.feature_count, 1)
+        return {
+            "rows": rows,
+            "confusion_matrix": self.confusion.tolist(),
+            "accuracy": (tn + tp) / rows if rows else 0.0,
+            "classes": classes,
+            "roc_auc": auc,
+            "auc_error_bound": bound,
+            "features": {
+                name: {"count": int(self.feature_count[i]), "mean": float(self.feature_mean[i]),
+                       "std": float(np.sqrt(self.feature_m2[i] / count[i])),
+                       "min": float(self.feature_min[i]), "max": float(self.feature_max[i])}
+                for i, name in enumerate(FEATURES[:len(self.feature_count)])
+            },
+        }
+
+    def save(self, path):
+        np.savez(path, n_bins=self.n_bins, **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            accumulator = cls(int(data["n_bins"]), len(data["feature_count"]))
+            for name in cls.ARRAYS:
+                setattr(accumulator, name, data[name].copy())
+        return accumulator
+
+
+def evaluate_chunks(scorer, chunks, n_bins=DEFAULT_BINS, accumulator=None):
+    """Score labeled DataFrame chunks and fold them into an accumulator."""
+    accumulator = accumulator or EvaluationAccumulator(n_bins)
+    for chunk in chunks:
+        X = scorer.as_matrix(chunk)
+        probabilities, predictions = scorer.score_batch(X)
+        accumulator.update(chunk[LABEL].to_numpy(), probabilities, predictions, X)
+    return accumulator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate the fraud model on labeled data, chunk by chunk.")
+    parser.add_argument("inputs", nargs="*", help="labeled CSV or Parquet files")
+    parser.add_argument("--merge", nargs="+", default=[], metavar="NPZ", help="saved accumulators to fold in")
+    parser.add_argument("--save", help="write the accumulator here (.npz) for a later --merge")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument("--bins", type=int, default=DEFAULT_BINS, help="score histogram resolution")
+    args = parser.parse_args(argv)
+    if not args.inputs and not args.merge:
+        parser.error("give input files and/or --merge accumulators")
+
+    accumulator = EvaluationAccumulator(args.bins)
+    for path in args.merge:
+        accumulator.merge(EvaluationAccumulator.load(path))
+    if args.inputs:
+        scorer = FraudScorer.from_files(args.model, args.scaler)
+        for path in args.inputs:
+            evaluate_chunks(scorer, iter_batches(path, args.batch_rows), accumulator=accumulator)
+            print(f"📊 {path}: {accumulator.rows:,} rows so far", file=sys.stderr)
+    if args.save:
+        accumulator.save(args.save)
+    json.dump(accumulator.report(), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
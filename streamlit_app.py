@@ -1,13 +1,20 @@
 import streamlit as st
-import numpy as np
-import joblib
+import atexit
+import os
 import time
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import tempfile
 from datetime import datetime
-import json
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from model_registry import MODEL_PATH, ArtifactMismatchError, get_registry
+from fraud_scorer import FEATURES, FraudScorer
+from prediction_cache import PredictionCache
+from analysis_history import AnalysisHistory
+from live_metrics import LiveMetrics
+from audit_log import AuditLog, batch_record, decision_record
+from drift_monitor import DriftMonitor, DriftReference, reference_path_for
+from explanations import ExplanationService
+from risk_rules import METER_TERMS, RISK_RULES, evaluate_rules, meter_color, meter_risk
+from what_if import feature_values, sensitivity_grid
 
 # Page configuration
 st.set_page_config(
@@ -222,19 +229,144 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state for history
-if 'analysis_history' not in st.session_state:
-    st.session_state.analysis_history = []
+@st.cache_resource(max_entries=2)
+def scorer_for(version, _bundle):
+    return FraudScorer.from_bundle(_bundle)
 
-# Load saved model and scaler files
+
+def current_model():
+    # Fragments rerun without the top of the script, so they look the bundle up
+    # themselves and pick up a registry hot reload straight away
+    bundle = get_registry().get()
+    return bundle, scorer_for(bundle.version, bundle)
+
+
+# Load saved model and scaler files (once per process, shared by all sessions,
+# hot-reloaded by the registry when the files change)
 try:
-    model = joblib.load("fraud_detection_model.pkl")
-    scaler = joblib.load("scaler.pkl")
+    model_bundle, scorer = current_model()
     model_loaded = True
+except ArtifactMismatchError as e:
+    model_loaded = False
+    st.error(f"⚠️ Model artifacts failed verification: {str(e)}. Re-run train_model.py to publish a consistent model/scaler pair.")
 except Exception as e:
     model_loaded = False
     st.error(f"⚠️ Model files not found: {str(e)}. Please ensure fraud_detection_model.pkl and scaler.pkl are in the same directory.")
 
+# Form inputs live in session state under their widget keys, so every fragment
+# reads the same application; the sidebar presets write the same keys
+INPUT_KEYS = {
+    'loan_amount': 'loanamount', 'loan_tenure_months': 'loantenuremonths', 'ltv': 'ltv',
+    'valuation_diff_pct': 'valuationdiffpct', 'num_prev_mortgages': 'numprevmortgages',
+    'ownership_match_score': 'ownershipmatchscore', 'ocr_confidence': 'ocrconfidence',
+    'encumbrance_flag': 'encumbranceflag', 'credit_score': 'creditscore', 'income': 'income'
+}
+INPUT_DEFAULTS = {
+    'loanamount': 0, 'loantenuremonths': 360, 'ltv': 80.0, 'valuationdiffpct': 0.0,
+    'ownershipmatchscore': 0.8, 'ocrconfidence': 0.85, 'encumbranceflag': 0,
+    'numprevmortgages': 0, 'creditscore': 700, 'income': 50000
+}
+for input_key, default in INPUT_DEFAULTS.items():
+    st.session_state.setdefault(input_key, default)
+
+# The only inputs behind the heuristic risk score and the live meter
+RISK_INPUTS = tuple(dict.fromkeys([rule.feature for rule in RISK_RULES] + [term.feature for term in METER_TERMS]))
+
+
+def entered_application():
+    """The application as currently entered, keyed by FEATURES."""
+    return {feature: st.session_state[key] for feature, key in INPUT_KEYS.items()}
+
+
+@st.cache_resource
+def get_scoring_executor():
+    # Shared by all sessions; scoring work runs here instead of on the script thread
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="fraud-scoring")
+
+
+@st.cache_resource
+def get_prediction_cache():
+    # Process-wide, so presets and repeat applications hit across sessions
+    return PredictionCache(maxsize=4096)
+
+
+@st.cache_resource
+def get_analysis_history():
+    history = AnalysisHistory(capacity=1000, flush_rows=64)
+    # Spill whatever is still buffered when the server shuts down
+    atexit.register(history.flush)
+    return history
+
+
+analysis_history = get_analysis_history()
+
+
+@st.cache_resource
+def get_live_metrics():
+    return LiveMetrics()
+
+
+live_metrics = get_live_metrics()
+
+
+@st.cache_resource(max_entries=1)
+def load_drift_monitor(reference_path, mtime_ns):
+    # Process-wide fixed-size histograms, started afresh when a new reference is published
+    return DriftMonitor(DriftReference.load(reference_path))
+
+
+def get_drift_monitor():
+    # None until train_model.py has published a reference; checked on every rerun
+    # rather than cached, so drift tracking starts as soon as the file appears
+    reference_path = reference_path_for(MODEL_PATH)
+    try:
+        mtime_ns = os.stat(reference_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return load_drift_monitor(reference_path, mtime_ns)
+
+
+drift_monitor = get_drift_monitor()
+
+
+@st.cache_resource
+def get_audit_log():
+    audit = AuditLog()
+    # Drain the queue to disk when the server shuts down
+    atexit.register(audit.close)
+    return audit
+
+
+audit_log = get_audit_log()
+
+
+def timed(fn, *args):
+    """Run fn(*args) and return (result, elapsed milliseconds)."""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def explain_risk_factors(ltv, creditscore, ocrconfidence):
+    ltv_risk = "🔴 High" if ltv > 80 else "🟡 Medium" if ltv > 60 else "🟢 Low"
+    credit_risk = "🔴 High" if creditscore < 650 else "🟡 Medium" if creditscore < 750 else "🟢 Low"
+    doc_risk = "🔴 High" if ocrconfidence < 0.7 else "🟡 Medium" if ocrconfidence < 0.9 else "🟢 Low"
+    return ltv_risk, credit_risk, doc_risk
+
+
+@st.cache_resource
+def get_explanation_service():
+    # One TreeExplainer per model version, shared by all sessions. Explanations get
+    # their own threads: ones that overrun the budget must not hold up verdicts
+    return ExplanationService(ThreadPoolExecutor(max_workers=2, thread_name_prefix="fraud-explain"),
+                              budget_s=0.5)
+
+
+explanation_service = get_explanation_service()
+if model_loaded:
+    # Build the explainer in the background so the first analysis does not pay for it
+    explanation_service.warm(model_bundle)
+
 # Main title with animation
 st.markdown('<h1 class="main-title">🛡️ AI FRAUD DETECTION SYSTEM</h1>', unsafe_allow_html=True)
 st.markdown('<p class="subtitle">Advanced Machine Learning for Financial Security & Land Collateral Analysis</p>', unsafe_allow_html=True)
@@ -291,282 +423,515 @@ if model_loaded:
         
         st.markdown("---")
         
-        # Export history
-        if len(st.session_state.analysis_history) > 0:
+        # Export history (streamed from the on-disk store, segment by segment)
+        if len(analysis_history) > 0:
             if st.button("📊 Export Analysis History"):
-                df = pd.DataFrame(st.session_state.analysis_history)
-                csv = df.to_csv(index=False)
+                export_file = tempfile.TemporaryFile(mode="w+b", buffering=0)
+                analysis_history.export_csv(export_file)
+                export_file.seek(0)
                 st.download_button(
                     label="💾 Download CSV",
-                    data=csv,
+                    data=export_file,
                     file_name=f"fraud_analysis_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
         
         if st.button("🗑️ Clear History"):
-            st.session_state.analysis_history = []
+            analysis_history.clear()
             st.success("History cleared!")
+
+
+def loan_payments(loanamount, loantenuremonths, interest_rate=0.05):
+    # Calculate monthly payment (rough estimate, 5% annual rate)
+    monthly_rate = interest_rate / 12
+    num_payments = loantenuremonths
+    if monthly_rate > 0:
+        monthly_payment = loanamount * (monthly_rate * (1 + monthly_rate)**num_payments) / ((1 + monthly_rate)**num_payments - 1)
+    else:
+        monthly_payment = loanamount / num_payments
+    total_payment = monthly_payment * num_payments
+    return monthly_payment, total_payment - loanamount, total_payment
+
+
+@st.cache_data(max_entries=1024)
+def assess_application(application):
+    # Rule-based risk score and factors, plus the live meter; ``application`` holds just the RISK_INPUTS
+    rule_result = evaluate_rules(application)
+    overall_risk = float(meter_risk(application)[0])
+    return int(rule_result.score[0]), rule_result.factors(0), overall_risk, meter_color(overall_risk)[0]
+
+
+def loan_calculator(loanamount, loantenuremonths):
+    # Loan Calculator Section to fill blank space
+    st.markdown('<div class="input-container">', unsafe_allow_html=True)
+    st.markdown('<h3 class="section-header">🧮 Quick Loan Calculator</h3>', unsafe_allow_html=True)
+
+    if loanamount > 0 and loantenuremonths > 0:
+        monthly_payment, total_interest, total_payment = loan_payments(loanamount, loantenuremonths)
+
+        col_calc1, col_calc2, col_calc3 = st.columns(3)
+        with col_calc1:
+            st.metric("💳 Monthly Payment", f"${monthly_payment:,.0f}")
+        with col_calc2:
+            st.metric("💰 Total Interest", f"${total_interest:,.0f}")
+        with col_calc3:
+            st.metric("📊 Total Payment", f"${total_payment:,.0f}")
+    else:
+        st.info("💡 Enter loan amount and tenure above to see payment calculations")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def risk_assessment(risk_score, risk_factors):
+    # Real-time Risk Assessment to fill more blank space
+    st.markdown('<div class="input-container">', unsafe_allow_html=True)
+    st.markdown('<h3 class="section-header">⚡ Real-time Risk Assessment</h3>', unsafe_allow_html=True)
+
+    # Display risk assessment
+    if risk_score == 0:
+        st.success("✅ **Excellent Profile** - No major risk factors detected")
+    elif risk_score <= 20:
+        st.info(f"ℹ️ **Low Risk Profile** - Risk Score: {risk_score}/100")
+    elif risk_score <= 50:
+        st.warning(f"⚠️ **Moderate Risk Profile** - Risk Score: {risk_score}/100")
+    else:
+        st.error(f"🚨 **High Risk Profile** - Risk Score: {risk_score}/100")
+
+    if risk_factors:
+        st.write("**Identified Risk Factors:**")
+        for factor in risk_factors:
+            st.write(f"• {factor}")
+
+    # Progress bar for risk score
+    risk_percentage = min(risk_score, 100)
+    st.progress(risk_percentage / 100)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def risk_meter(overall_risk, risk_color):
+    # Interactive Risk Meter
+    st.markdown('<h4 class="section-header">🎯 Live Risk Meter</h4>', unsafe_allow_html=True)
+
+    # Simple progress bar risk meter
+    st.markdown(f"""
+    <div class="info-card">
+        <h5>Current Risk Level: {overall_risk:.0f}/100</h5>
+        <div style="background: rgba(255,255,255,0.1); border-radius: 10px; padding: 5px;">
+            <div style="width: {overall_risk}%; height: 20px; background: {risk_color}; border-radius: 5px; transition: all 0.3s ease;"></div>
+        </div>
+        <p><small>Updates in real-time as you modify inputs</small></p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+@st.fragment
+def analysis_result():
+    # Clicking analyze reruns only this fragment; it reads the inputs from session state
+    current_application = entered_application()
+    model_bundle, scorer = current_model()
+    drift_monitor = get_drift_monitor()
+    risk_score = assess_application({feature: current_application[feature] for feature in RISK_INPUTS})[0]
+    ltv = current_application['ltv']
+    creditscore = current_application['credit_score']
+    ocrconfidence = current_application['ocr_confidence']
     
-    # Create two columns for better layout
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        # Form validation function
-        def validate_inputs():
-            errors = []
-            if loanamount <= 0:
-                errors.append("Loan amount must be greater than 0")
-            if loanamount > 10000000:
-                errors.append("Loan amount seems unusually high (>$10M)")
-            if loantenuremonths > 480:
-                errors.append("Loan tenure exceeds maximum (40 years)")
-            if ltv > 100:
-                errors.append("LTV cannot exceed 100%")
-            if abs(valuationdiffpct) > 50:
-                errors.append("Valuation difference seems extreme (>50%)")
-            if creditscore > 850:
-                errors.append("Credit score cannot exceed 850")
-            if income > 10000000:
-                errors.append("Income seems unusually high (>$10M)")
-            return errors
-        
-        st.markdown('<div class="input-container">', unsafe_allow_html=True)
-        st.markdown('<h3 class="section-header">💰 Loan Information</h3>', unsafe_allow_html=True)
-        
-        col_a, col_b = st.columns(2)
-        with col_a:
-            loanamount = st.number_input(
-                "💵 Loan Amount ($)", 
-                min_value=0, 
-                value=st.session_state.get('loanamount', 0),
-                help="Total loan amount requested (e.g., $250,000)",
-                format="%d"
-            )
-        with col_b:
-            loantenuremonths = st.number_input(
-                "📅 Loan Tenure (Months)", 
-                min_value=1, 
-                max_value=480,
-                value=st.session_state.get('loantenuremonths', 360),
-                help="Duration of the loan in months (e.g., 360 for 30 years)"
-            )
-        
-        ltv = st.slider(
-            "📊 Loan to Value Ratio (%)", 
-            min_value=0.0, 
-            max_value=100.0, 
-            value=st.session_state.get('ltv', 80.0),
-            step=0.1,
-            help="Percentage of property value being borrowed. Higher LTV = Higher Risk"
-        )
-        
-        # LTV risk indicator
-        if ltv > 90:
-            st.error("🚨 Very High LTV Risk (>90%)")
-        elif ltv > 80:
-            st.warning("⚠️ High LTV Risk (>80%)")
-        elif ltv > 60:
-            st.info("ℹ️ Moderate LTV Risk (60-80%)")
-        else:
-            st.success("✅ Low LTV Risk (<60%)")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        st.markdown('<div class="input-container">', unsafe_allow_html=True)
-        st.markdown('<h3 class="section-header">🏡 Property & Valuation</h3>', unsafe_allow_html=True)
-        
-        col_c, col_d = st.columns(2)
-        with col_c:
-            valuationdiffpct = st.number_input(
-                "📈 Valuation Difference (%)", 
-                value=st.session_state.get('valuationdiffpct', 0.0),
-                format="%.2f", 
-                help="Difference between expected and actual property valuation. Negative = Overvalued"
-            )
-        with col_d:
-            ownershipmatchscore = st.slider(
-                "🔍 Ownership Match Score", 
-                min_value=0.0, 
-                max_value=1.0, 
-                value=st.session_state.get('ownershipmatchscore', 0.8),
-                step=0.01,
-                format="%.2f", 
-                help="How well ownership documents match (1.0 = Perfect Match)"
-            )
-        
-        col_e, col_f = st.columns(2)
-        with col_e:
-            ocrconfidence = st.slider(
-                "📄 Document OCR Confidence", 
-                min_value=0.0, 
-                max_value=1.0, 
-                value=st.session_state.get('ocrconfidence', 0.85),
-                step=0.01,
-                format="%.2f", 
-                help="Confidence level of document text recognition (1.0 = Perfect Recognition)"
-            )
-        with col_f:
-            encumbranceflag = st.selectbox(
-                "⚖️ Encumbrance Status", 
-                [0, 1], 
-                index=st.session_state.get('encumbranceflag', 0),
-                format_func=lambda x: "✅ No Encumbrance" if x == 0 else "⚠️ Has Encumbrance", 
-                help="Whether property has legal encumbrances or liens"
-            )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        st.markdown('<div class="input-container">', unsafe_allow_html=True)
-        st.markdown('<h3 class="section-header">👤 Applicant Profile</h3>', unsafe_allow_html=True)
-        
-        col_g, col_h = st.columns(2)
-        with col_g:
-            numprevmortgages = st.number_input(
-                "🏠 Previous Mortgages Count", 
-                min_value=0, 
-                max_value=20,
-                value=st.session_state.get('numprevmortgages', 0),
-                help="Number of previous mortgage loans"
-            )
-        with col_h:
-            creditscore = st.number_input(
-                "💳 Credit Score", 
-                min_value=300, 
-                max_value=850,
-                value=st.session_state.get('creditscore', 700),
-                help="Applicant's credit score (300-850)"
+    # Analysis button
+    st.markdown("<br>", unsafe_allow_html=True)
+    if st.button("🔍 ANALYZE FRAUD RISK"):
+        # Show loading animation
+        with st.spinner('🤖 AI is analyzing the application...'):
+            executor = get_scoring_executor()
+            prediction_cache = get_prediction_cache()
+            stage_ms = {}
+            analysis_started = time.perf_counter()
+            
+            # Repeat applications (presets, slider wiggles) are served from the cache
+            cache_key = prediction_cache.key(
+                [current_application[feature] for feature in FEATURES],
+                model_bundle.version
             )
-        
-        income = st.number_input(
-            "💰 Annual Income ($)", 
-            min_value=0, 
-            value=st.session_state.get('income', 50000),
-            format="%d",
-            help="Applicant's annual gross income"
-        )
-        
-        # Credit score indicator
-        if creditscore >= 750:
-            st.success("✅ Excellent Credit Score (750+)")
-        elif creditscore >= 700:
-            st.info("ℹ️ Good Credit Score (700-749)")
-        elif creditscore >= 650:
-            st.warning("⚠️ Fair Credit Score (650-699)")
-        else:
-            st.error("🚨 Poor Credit Score (<650)")
-        
-        # Debt-to-income ratio calculation
-        if income > 0 and loanamount > 0:
-            monthly_payment = (loanamount * 0.05) / 12  # Rough estimate
-            dti_ratio = (monthly_payment * 12) / income * 100
-            st.metric("📊 Estimated Debt-to-Income Ratio", f"{dti_ratio:.1f}%", 
-                     "High Risk" if dti_ratio > 43 else "Acceptable" if dti_ratio > 28 else "Low Risk")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Loan Calculator Section to fill blank space
-        st.markdown('<div class="input-container">', unsafe_allow_html=True)
-        st.markdown('<h3 class="section-header">🧮 Quick Loan Calculator</h3>', unsafe_allow_html=True)
-        
-        if loanamount > 0 and loantenuremonths > 0:
-            # Calculate monthly payment (rough estimate)
-            interest_rate = 0.05  # 5% annual rate
-            monthly_rate = interest_rate / 12
-            num_payments = loantenuremonths
+            stage_results = {"Prediction": prediction_cache.get(cache_key)}
+            cache_hit = stage_results["Prediction"] is not None
+            stage_futures = {
+                executor.submit(timed, explain_risk_factors, ltv, creditscore, ocrconfidence): "Explanation",
+            }
             
-            if monthly_rate > 0:
-                monthly_payment = loanamount * (monthly_rate * (1 + monthly_rate)**num_payments) / ((1 + monthly_rate)**num_payments - 1)
+            progress_bar = st.progress(0.0, text="⚙️ Scaling features...")
+            if cache_hit:
+                stage_ms["Cache lookup"] = (time.perf_counter() - analysis_started) * 1000
+                # Only the audit record needs the scaled vector on a hit
+                input_scaled = scorer.transform(cache_key[1])
             else:
-                monthly_payment = loanamount / num_payments
+                # Scale features (off the script thread)
+                input_scaled, stage_ms["Scaling"] = executor.submit(timed, scorer.transform, cache_key[1]).result()
+                stage_futures[executor.submit(timed, scorer.predict_scaled, input_scaled)] = "Prediction"
             
-            total_payment = monthly_payment * num_payments
-            total_interest = total_payment - loanamount
+            # Predict and explain concurrently; progress advances as each stage finishes
+            progress_bar.progress(1 / 3, text="🌲 Running Random Forest and risk factor analysis...")
+            for done, future in enumerate(as_completed(stage_futures), start=4 - len(stage_futures)):
+                stage = stage_futures[future]
+                stage_results[stage], stage_ms[stage] = future.result()
+                progress_bar.progress(done / 3, text=f"✅ {stage} complete")
+            if not cache_hit:
+                prediction_cache.put(cache_key, stage_results["Prediction"])
+            stage_ms["Total"] = (time.perf_counter() - analysis_started) * 1000
             
-            col_calc1, col_calc2, col_calc3 = st.columns(3)
-            with col_calc1:
-                st.metric("💳 Monthly Payment", f"${monthly_payment:,.0f}")
-            with col_calc2:
-                st.metric("💰 Total Interest", f"${total_interest:,.0f}")
-            with col_calc3:
-                st.metric("📊 Total Payment", f"${total_payment:,.0f}")
-        else:
-            st.info("💡 Enter loan amount and tenure above to see payment calculations")
+            probabilities, predictions = stage_results["Prediction"]
+            prediction_prob = float(probabilities[0])
+            ltv_risk, credit_risk, doc_risk = stage_results["Explanation"]
+            
+            progress_bar.empty()
         
-        st.markdown('</div>', unsafe_allow_html=True)
+        # Record the analysis
+        live_metrics.record(prediction_prob, predictions[0])
+        if drift_monitor is not None:
+            drift_monitor.update([current_application[feature] for feature in FEATURES], prediction_prob)
+        # Log the rounded vector the model actually scored, so --rescore reproduces it
+        audit_log.append(decision_record(dict(zip(FEATURES, cache_key[1])), input_scaled, prediction_prob,
+                                         predictions[0], model_bundle.content_version, source="app"))
+        analysis_history.append({
+            **current_application,
+            'fraud_probability': prediction_prob,
+            'prediction': int(predictions[0]),
+            'risk_score': risk_score,
+            'model_version': model_bundle.version,
+        })
         
-        # Real-time Risk Assessment to fill more blank space
-        st.markdown('<div class="input-container">', unsafe_allow_html=True)
-        st.markdown('<h3 class="section-header">⚡ Real-time Risk Assessment</h3>', unsafe_allow_html=True)
+        cache_stats = prediction_cache.stats()
+        stage_timings = " • ".join(f"{stage}: {ms:.3f} ms" if ms < 1 else f"{stage}: {ms:.1f} ms"
+                                   for stage, ms in stage_ms.items())
+        stage_timings += (f" • Cache {'hit' if cache_hit else 'miss'} "
+                          f"({cache_stats['hits']} hits / {cache_stats['misses']} misses)")
         
-        # Calculate preliminary risk score
-        risk_factors = []
-        risk_score = 0
+        # Display results with animation
+        if predictions[0] == 1:
+            st.markdown(f"""
+            <div class="result-card danger-card">
+                <h2 style="color: #ff0040; text-align: center; font-family: 'Orbitron', monospace;">
+                    🚨 HIGH FRAUD RISK DETECTED
+                </h2>
+                <div style="text-align: center; font-size: 2rem; margin: 1rem 0;">
+                    <strong>Risk Probability: {prediction_prob:.1%}</strong>
+                </div>
+                <p style="text-align: center; font-size: 1.1rem;">
+                    ⚠️ This application shows significant fraud indicators. Recommend manual review and additional verification.
+                </p>
+                <p style="text-align: center; color: #888;"><small>⏱️ {stage_timings}</small></p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="result-card safe-card">
+                <h2 style="color: #00ff00; text-align: center; font-family: 'Orbitron', monospace;">
+                    ✅ LOW FRAUD RISK
+                </h2>
+                <div style="text-align: center; font-size: 2rem; margin: 1rem 0;">
+                    <strong>Safety Probability: {1-prediction_prob:.1%}</strong>
+                </div>
+                <p style="text-align: center; font-size: 1.1rem;">
+                    🛡️ Application appears legitimate based on current analysis. Standard processing recommended.
+                </p>
+                <p style="text-align: center; color: #888;"><small>⏱️ {stage_timings}</small></p>
+            </div>
+            """, unsafe_allow_html=True)
         
-        if ltv > 90:
-            risk_factors.append("🔴 Extremely High LTV")
-            risk_score += 30
-        elif ltv > 80:
-            risk_factors.append("🟠 High LTV")
-            risk_score += 20
-        elif ltv > 60:
-            risk_factors.append("🟡 Moderate LTV")
-            risk_score += 10
+        # Risk factor breakdown
+        st.markdown('<h3 class="section-header">📊 Risk Factor Analysis</h3>', unsafe_allow_html=True)
         
-        if creditscore < 600:
-            risk_factors.append("🔴 Very Poor Credit")
-            risk_score += 25
-        elif creditscore < 650:
-            risk_factors.append("🟠 Poor Credit")
-            risk_score += 15
-        elif creditscore < 700:
-            risk_factors.append("🟡 Fair Credit")
-            risk_score += 5
+        col1, col2, col3 = st.columns(3)
         
-        if ocrconfidence < 0.7:
-            risk_factors.append("🔴 Poor Document Quality")
-            risk_score += 20
-        elif ocrconfidence < 0.9:
-            risk_factors.append("🟡 Moderate Document Quality")
-            risk_score += 10
+        with col1:
+            st.metric("LTV Risk", f"{ltv:.1f}%", ltv_risk)
         
-        if abs(valuationdiffpct) > 15:
-            risk_factors.append("🔴 Significant Valuation Issue")
-            risk_score += 15
-        elif abs(valuationdiffpct) > 5:
-            risk_factors.append("🟡 Minor Valuation Concern")
-            risk_score += 8
+        with col2:
+            st.metric("Credit Risk", f"{creditscore}", credit_risk)
         
-        if numprevmortgages > 3:
-            risk_factors.append("🟠 Multiple Previous Mortgages")
-            risk_score += 10
+        with col3:
+            st.metric("Document Risk", f"{ocrconfidence:.2f}", doc_risk)
         
-        # Display risk assessment
-        if risk_score == 0:
-            st.success("✅ **Excellent Profile** - No major risk factors detected")
-        elif risk_score <= 20:
-            st.info(f"ℹ️ **Low Risk Profile** - Risk Score: {risk_score}/100")
-        elif risk_score <= 50:
-            st.warning(f"⚠️ **Moderate Risk Profile** - Risk Score: {risk_score}/100")
+        # Model drivers: SHAP attributions, rendered after the verdict and bounded by the latency budget
+        st.markdown('<h3 class="section-header">🧠 What Drove This Prediction</h3>', unsafe_allow_html=True)
+        try:
+            attribution, explain_s = explanation_service.explain(model_bundle, input_scaled)
+        except Exception as e:
+            attribution = None
+            st.warning(f"⚠️ Explanation unavailable: {str(e)}")
         else:
-            st.error(f"🚨 **High Risk Profile** - Risk Score: {risk_score}/100")
-        
-        if risk_factors:
-            st.write("**Identified Risk Factors:**")
-            for factor in risk_factors:
-                st.write(f"• {factor}")
+            if attribution is None:
+                st.info(f"⏳ Explanation is taking longer than {explanation_service.budget_s * 1000:.0f} ms; "
+                        "it will be shown on the next analysis of this application.")
+        if attribution is not None:
+            for feature, contribution in attribution.top(FEATURES, count=5):
+                direction = "🔺 raises" if contribution > 0 else "🔻 lowers"
+                st.markdown(f"**{feature.replace('_', ' ').title()}** = {current_application[feature]:,} "
+                            f"{direction} fraud probability by **{abs(contribution):.1%}**")
+            st.caption(f"Baseline fraud probability {attribution.base_value:.1%} • explained in {explain_s * 1000:.0f} ms")
+
+
+@st.cache_data(max_entries=64)
+def what_if_surface(application, x_feature, y_feature, points, model_version, _scorer):
+    # The whole grid goes through one vectorized predict_proba; model_version keys the cache
+    x_values = feature_values(x_feature, points)
+    y_values = feature_values(y_feature, points) if y_feature else None
+    return sensitivity_grid(_scorer, application, x_feature, x_values, y_feature, y_values)
+
+
+def feature_label(feature):
+    return feature.replace('_', ' ').title()
+
+
+@st.fragment
+def what_if_explorer():
+    # Its own widgets rerun only this panel. An expander still runs its body while
+    # collapsed, so nothing is scored (and plotly is not imported) until the toggle is on
+    with st.expander("🧪 What-If Sensitivity Explorer", expanded=False):
+        st.markdown("See how the fraud probability moves when one or two inputs change, "
+                    "with everything else held at the current application.")
+        if not st.toggle("Run the sensitivity analysis", key="whatif_enabled"):
+            return
+        # Form changes rerun only their own panels; this one picks them up on its next interaction
+        current_application = entered_application()
+        model_bundle, scorer = current_model()
+        st.button("🔄 Use the current inputs", key="whatif_refresh")
+        col_x, col_y, col_n = st.columns(3)
+        with col_x:
+            x_feature = st.selectbox("📈 Vary", FEATURES, index=FEATURES.index('ltv'),
+                                     format_func=feature_label, key="whatif_x")
+        with col_y:
+            y_feature = st.selectbox("📉 Against (optional)", [None] + [f for f in FEATURES if f != x_feature],
+                                     format_func=lambda f: "— None —" if f is None else feature_label(f),
+                                     key="whatif_y")
+        with col_n:
+            points = st.select_slider("🔢 Grid points per feature", options=[20, 50, 100, 200], value=50,
+                                      key="whatif_points")
         
-        # Progress bar for risk score
-        risk_percentage = min(risk_score, 100)
-        st.progress(risk_percentage / 100)
+        # plotly is only needed here; importing it on first use keeps it off the startup path
+        import plotly.graph_objects as go
         
-        st.markdown('</div>', unsafe_allow_html=True)
+        started = time.perf_counter()
+        grid = what_if_surface(current_application, x_feature, y_feature, points, model_bundle.version, scorer)
+        elapsed_ms = (time.perf_counter() - started) * 1000
         
-        # Input validation
-        validation_errors = validate_inputs()
-        if validation_errors:
-            st.error("⚠️ Please fix the following issues:")
-            for error in validation_errors:
-                st.error(f"• {error}")
+        if y_feature is None:
+            fig = go.Figure(go.Scatter(x=grid.x_values, y=grid.probabilities[0], mode="lines",
+                                       line=dict(color="#00ffff", width=3)))
+            fig.add_vline(x=current_application[x_feature], line_dash="dash", line_color="#ff00ff",
+                          annotation_text="Current")
+            fig.update_yaxes(title="Fraud probability", range=[0, 1], tickformat=".0%")
+        else:
+            fig = go.Figure(go.Heatmap(x=grid.x_values, y=grid.y_values, z=grid.probabilities,
+                                       zmin=0, zmax=1, colorscale="RdYlGn_r",
+                                       colorbar=dict(title="Fraud<br>probability", tickformat=".0%")))
+            fig.add_trace(go.Scatter(x=[current_application[x_feature]], y=[current_application[y_feature]],
+                                     mode="markers", marker=dict(symbol="x", size=14, color="#00ffff"),
+                                     name="Current"))
+            fig.update_yaxes(title=feature_label(y_feature))
+        fig.update_xaxes(title=feature_label(x_feature))
+        fig.update_layout(template="plotly_dark", height=420, showlegend=False,
+                          margin=dict(l=10, r=10, t=30, b=10))
+        st.plotly_chart(fig, width="stretch")
+        st.caption(f"⚡ {grid.probabilities.size:,} grid points scored in one batch • {elapsed_ms:.0f} ms")
+
+
+def show_validation_errors(errors):
+    if errors:
+        st.error("⚠️ Please fix the following issues:")
+        for error in errors:
+            st.error(f"• {error}")
+
+
+@st.fragment
+def loan_terms():
+    # Amount, tenure and income feed only the calculator and the debt-to-income
+    # estimate here, so changing them reruns just this panel
+    st.markdown('<div class="input-container">', unsafe_allow_html=True)
+    st.markdown('<h3 class="section-header">💰 Loan Information</h3>', unsafe_allow_html=True)
+    
+    col_a, col_b = st.columns(2)
+    with col_a:
+        loanamount = st.number_input(
+            "💵 Loan Amount ($)", 
+            min_value=0, 
+            key='loanamount',
+            help="Total loan amount requested (e.g., $250,000)",
+            format="%d"
+        )
+    with col_b:
+        loantenuremonths = st.number_input(
+            "📅 Loan Tenure (Months)", 
+            min_value=1, 
+            max_value=480,
+            key='loantenuremonths',
+            help="Duration of the loan in months (e.g., 360 for 30 years)"
+        )
+    
+    income = st.number_input(
+        "💰 Annual Income ($)", 
+        min_value=0, 
+        key='income',
+        format="%d",
+        help="Applicant's annual gross income"
+    )
+    
+    # Debt-to-income ratio calculation
+    if income > 0 and loanamount > 0:
+        monthly_payment = (loanamount * 0.05) / 12  # Rough estimate
+        dti_ratio = (monthly_payment * 12) / income * 100
+        st.metric("📊 Estimated Debt-to-Income Ratio", f"{dti_ratio:.1f}%", 
+                 "High Risk" if dti_ratio > 43 else "Acceptable" if dti_ratio > 28 else "Low Risk")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    loan_calculator(loanamount, loantenuremonths)
+    
+    errors = []
+    if loanamount <= 0:
+        errors.append("Loan amount must be greater than 0")
+    if loanamount > 10000000:
+        errors.append("Loan amount seems unusually high (>$10M)")
+    if loantenuremonths > 480:
+        errors.append("Loan tenure exceeds maximum (40 years)")
+    if income > 10000000:
+        errors.append("Income seems unusually high (>$10M)")
+    show_validation_errors(errors)
+
+
+@st.fragment
+def risk_profile():
+    # Holds every RISK_INPUTS widget, so the risk assessment and the live meter
+    # rerun together when one of them changes and nothing else does
+    st.markdown('<div class="input-container">', unsafe_allow_html=True)
+    st.markdown('<h3 class="section-header">🏡 Property & Valuation</h3>', unsafe_allow_html=True)
+    
+    ltv = st.slider(
+        "📊 Loan to Value Ratio (%)", 
+        min_value=0.0, 
+        max_value=100.0, 
+        key='ltv',
+        step=0.1,
+        help="Percentage of property value being borrowed. Higher LTV = Higher Risk"
+    )
+    
+    # LTV risk indicator
+    if ltv > 90:
+        st.error("🚨 Very High LTV Risk (>90%)")
+    elif ltv > 80:
+        st.warning("⚠️ High LTV Risk (>80%)")
+    elif ltv > 60:
+        st.info("ℹ️ Moderate LTV Risk (60-80%)")
+    else:
+        st.success("✅ Low LTV Risk (<60%)")
+    
+    col_c, col_e = st.columns(2)
+    with col_c:
+        valuationdiffpct = st.number_input(
+            "📈 Valuation Difference (%)", 
+            key='valuationdiffpct',
+            format="%.2f", 
+            help="Difference between expected and actual property valuation. Negative = Overvalued"
+        )
+    with col_e:
+        st.slider(
+            "📄 Document OCR Confidence", 
+            min_value=0.0, 
+            max_value=1.0, 
+            key='ocrconfidence',
+            step=0.01,
+            format="%.2f", 
+            help="Confidence level of document text recognition (1.0 = Perfect Recognition)"
+        )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown('<div class="input-container">', unsafe_allow_html=True)
+    st.markdown('<h3 class="section-header">👤 Applicant Profile</h3>', unsafe_allow_html=True)
+    
+    col_g, col_h = st.columns(2)
+    with col_g:
+        st.number_input(
+            "🏠 Previous Mortgages Count", 
+            min_value=0, 
+            max_value=20,
+            key='numprevmortgages',
+            help="Number of previous mortgage loans"
+        )
+    with col_h:
+        creditscore = st.number_input(
+            "💳 Credit Score", 
+            min_value=300, 
+            max_value=850,
+            key='creditscore',
+            help="Applicant's credit score (300-850)"
+        )
+    
+    # Credit score indicator
+    if creditscore >= 750:
+        st.success("✅ Excellent Credit Score (750+)")
+    elif creditscore >= 700:
+        st.info("ℹ️ Good Credit Score (700-749)")
+    elif creditscore >= 650:
+        st.warning("⚠️ Fair Credit Score (650-699)")
+    else:
+        st.error("🚨 Poor Credit Score (<650)")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Real-time risk heuristics, memoized on the inputs they read
+    application = entered_application()
+    risk_score, risk_factors, overall_risk, risk_color = assess_application(
+        {feature: application[feature] for feature in RISK_INPUTS})
+    risk_assessment(risk_score, risk_factors)
+    risk_meter(overall_risk, risk_color)
+    
+    errors = []
+    if ltv > 100:
+        errors.append("LTV cannot exceed 100%")
+    if abs(valuationdiffpct) > 50:
+        errors.append("Valuation difference seems extreme (>50%)")
+    if creditscore > 850:
+        errors.append("Credit score cannot exceed 850")
+    show_validation_errors(errors)
+
+
+@st.fragment
+def title_checks():
+    # Only the model reads these; changing them redraws nothing else until analysis
+    st.markdown('<div class="input-container">', unsafe_allow_html=True)
+    st.markdown('<h3 class="section-header">📜 Title & Ownership</h3>', unsafe_allow_html=True)
+    
+    col_d, col_f = st.columns(2)
+    with col_d:
+        st.slider(
+            "🔍 Ownership Match Score", 
+            min_value=0.0, 
+            max_value=1.0, 
+            key='ownershipmatchscore',
+            step=0.01,
+            format="%.2f", 
+            help="How well ownership documents match (1.0 = Perfect Match)"
+        )
+    with col_f:
+        st.selectbox(
+            "⚖️ Encumbrance Status", 
+            [0, 1], 
+            key='encumbranceflag',
+            format_func=lambda x: "✅ No Encumbrance" if x == 0 else "⚠️ Has Encumbrance", 
+            help="Whether property has legal encumbrances or liens"
+        )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+if model_loaded:
+    # Each input panel is its own fragment: an edit reruns only the panel that
+    # depends on it, never the styling, info cards, sidebar or model loading
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        loan_terms()
+        risk_profile()
+        title_checks()
     
     with col2:
         st.markdown("""
@@ -584,8 +949,10 @@ if model_loaded:
         
         # Real-time system statistics
         current_time = datetime.now()
-        processed_today = 1247 + len(st.session_state.analysis_history)
-        fraud_detected = 23 + sum(1 for record in st.session_state.analysis_history if record.get('prediction') == 'High Risk')
+        today_counts = live_metrics.day_snapshot()
+        processed_today = today_counts["processed"]
+        fraud_detected = today_counts["flagged"]
+        success_rate = (processed_today - fraud_detected) / processed_today * 100 if processed_today else 100.0
         
         st.markdown(f"""
         <div class="info-card">
@@ -593,7 +960,7 @@ if model_loaded:
             <p><strong>Model Accuracy:</strong> 94.2%</p>
             <p><strong>Processed Today:</strong> {processed_today:,} applications</p>
             <p><strong>Fraud Detected:</strong> {fraud_detected} cases</p>
-            <p><strong>Success Rate:</strong> {((processed_today - fraud_detected) / processed_today * 100):.1f}%</p>
+            <p><strong>Success Rate:</strong> {success_rate:.1f}%</p>
             <p><strong>Last Updated:</strong> {current_time.strftime("%H:%M:%S")}</p>
             <p><strong>System Status:</strong> <span style="color: #00ff00;">✓ Online</span></p>
         </div>
@@ -612,41 +979,16 @@ if model_loaded:
         </div>
         """, unsafe_allow_html=True)
         
-        # Interactive Risk Meter
-        st.markdown('<h4 class="section-header">🎯 Live Risk Meter</h4>', unsafe_allow_html=True)
-        
-        # Calculate overall risk based on current inputs
-        overall_risk = 0
-        if ltv > 0:
-            overall_risk += min(ltv * 0.8, 60)  # LTV contribution
-        if creditscore > 0:
-            overall_risk += max(0, (750 - creditscore) * 0.15)  # Credit score contribution
-        overall_risk += (1 - ocrconfidence) * 30  # Document quality contribution
-        
-        overall_risk = min(overall_risk, 100)
-        
-        # Simple progress bar risk meter
-        risk_color = "#ff0000" if overall_risk > 75 else "#ffaa00" if overall_risk > 50 else "#ffff00" if overall_risk > 25 else "#00ff00"
-        st.markdown(f"""
-        <div class="info-card">
-            <h5>Current Risk Level: {overall_risk:.0f}/100</h5>
-            <div style="background: rgba(255,255,255,0.1); border-radius: 10px; padding: 5px;">
-                <div style="width: {overall_risk}%; height: 20px; background: {risk_color}; border-radius: 5px; transition: all 0.3s ease;"></div>
-            </div>
-            <p><small>Updates in real-time as you modify inputs</small></p>
-        </div>
-        """, unsafe_allow_html=True)
-        
         # Daily Fraud Alerts
-        st.markdown("""
+        st.markdown(f"""
         <div class="info-card">
             <h4>🚨 Today's Alerts</h4>
-            <p>🔴 <strong>High Risk:</strong> 12 applications</p>
-            <p>🟡 <strong>Medium Risk:</strong> 45 applications</p>
-            <p>🟢 <strong>Low Risk:</strong> 156 applications</p>
-            <p>✅ <strong>Approved:</strong> 89 applications</p>
+            <p>🔴 <strong>High Risk:</strong> {today_counts["by_band"]["High"]:,} applications</p>
+            <p>🟡 <strong>Medium Risk:</strong> {today_counts["by_band"]["Medium"]:,} applications</p>
+            <p>🟢 <strong>Low Risk:</strong> {today_counts["by_band"]["Low"]:,} applications</p>
+            <p>✅ <strong>Approved:</strong> {processed_today - fraud_detected:,} applications</p>
             <hr style="border-color: rgba(0,255,255,0.3);">
-            <p><small>🔄 Auto-refresh: ON</small></p>
+            <p><small>🔄 Counted across all sessions and workers</small></p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -663,76 +1005,86 @@ if model_loaded:
         </div>
         """, unsafe_allow_html=True)
     
-    # Analysis button
+    
+    analysis_result()
+    what_if_explorer()
+    
+    # Batch CSV scoring
     st.markdown("<br>", unsafe_allow_html=True)
-    if st.button("🔍 ANALYZE FRAUD RISK"):
-        # Show loading animation
-        with st.spinner('🤖 AI is analyzing the application...'):
-            progress_bar = st.progress(0)
-            for i in range(100):
-                time.sleep(0.01)
-                progress_bar.progress(i + 1)
-            
-            # Create feature array
-            input_features = np.array([[loanamount, loantenuremonths, ltv, valuationdiffpct,
-                                        numprevmortgages, ownershipmatchscore, ocrconfidence,
-                                        encumbranceflag, creditscore, income]])
-            
-            # Scale features
-            input_scaled = scaler.transform(input_features)
-            
-            # Predict using the model
-            prediction = model.predict(input_scaled)
-            prediction_prob = model.predict_proba(input_scaled)[0][1]
-            
-            progress_bar.empty()
-        
-        # Display results with animation
-        if prediction[0] == 1:
-            st.markdown(f"""
-            <div class="result-card danger-card">
-                <h2 style="color: #ff0040; text-align: center; font-family: 'Orbitron', monospace;">
-                    🚨 HIGH FRAUD RISK DETECTED
-                </h2>
-                <div style="text-align: center; font-size: 2rem; margin: 1rem 0;">
-                    <strong>Risk Probability: {prediction_prob:.1%}</strong>
-                </div>
-                <p style="text-align: center; font-size: 1.1rem;">
-                    ⚠️ This application shows significant fraud indicators. Recommend manual review and additional verification.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-            <div class="result-card safe-card">
-                <h2 style="color: #00ff00; text-align: center; font-family: 'Orbitron', monospace;">
-                    ✅ LOW FRAUD RISK
-                </h2>
-                <div style="text-align: center; font-size: 2rem; margin: 1rem 0;">
-                    <strong>Safety Probability: {1-prediction_prob:.1%}</strong>
-                </div>
-                <p style="text-align: center; font-size: 1.1rem;">
-                    🛡️ Application appears legitimate based on current analysis. Standard processing recommended.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Risk factor breakdown
-        st.markdown('<h3 class="section-header">📊 Risk Factor Analysis</h3>', unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            ltv_risk = "🔴 High" if ltv > 80 else "🟡 Medium" if ltv > 60 else "🟢 Low"
-            st.metric("LTV Risk", f"{ltv:.1f}%", ltv_risk)
-        
-        with col2:
-            credit_risk = "🔴 High" if creditscore < 650 else "🟡 Medium" if creditscore < 750 else "🟢 Low"
-            st.metric("Credit Risk", f"{creditscore}", credit_risk)
-        
-        with col3:
-            doc_risk = "🔴 High" if ocrconfidence < 0.7 else "🟡 Medium" if ocrconfidence < 0.9 else "🟢 Low"
-            st.metric("Document Risk", f"{ocrconfidence:.2f}", doc_risk)
+    with st.expander("📂 Batch Scoring (CSV Upload)", expanded=False):
+        st.markdown(
+            "Upload a CSV in the `loan_land_fraud.csv` schema. Rows are scored in vectorized "
+            "chunks and the scored file is offered for download."
+        )
+        batch_file = st.file_uploader("📄 Applications CSV", type=["csv"], key="batch_csv")
+        batch_chunk_rows = st.select_slider(
+            "⚙️ Rows per chunk",
+            options=[10_000, 50_000, 100_000, 250_000],
+            value=50_000,
+            help="Larger chunks are faster but use more memory"
+        )
+        if batch_file is not None and st.button("🚀 SCORE FILE"):
+            scored_file = tempfile.TemporaryFile(mode="w+b", buffering=0)
+            batch_progress = st.progress(0.0)
+            batch_status = st.empty()
+            rows_scored = 0
+            rows_flagged = 0
+            batch_started = time.perf_counter()
+            try:
+                batch_file.seek(0)
+                for chunk in scorer.score_iter(batch_file, chunksize=batch_chunk_rows):
+                    chunk.to_csv(scored_file, header=rows_scored == 0, index=False)
+                    live_metrics.record_many(chunk["fraud_probability"], chunk["prediction"])
+                    chunk_rows = scorer.as_matrix(chunk)
+                    if drift_monitor is not None:
+                        drift_monitor.update(chunk_rows, chunk["fraud_probability"])
+                    # One columnar record per chunk: per-row records throttle large uploads
+                    audit_log.append(batch_record(chunk_rows, scorer.transform(chunk_rows), chunk["fraud_probability"],
+                                                  chunk["prediction"], model_bundle.content_version,
+                                                  source="app-batch"))
+                    rows_scored += len(chunk)
+                    rows_flagged += int((chunk["prediction"] == 1).sum())
+                    batch_progress.progress(min(batch_file.tell() / max(batch_file.size, 1), 1.0))
+                    batch_status.text(f"Scored {rows_scored:,} rows ({rows_flagged:,} flagged)")
+            except Exception as e:
+                scored_file.close()
+                batch_progress.empty()
+                st.error(f"⚠️ Could not score file: {str(e)}")
+            else:
+                elapsed = time.perf_counter() - batch_started
+                batch_progress.progress(1.0)
+                batch_status.empty()
+                st.success(
+                    f"✅ Scored {rows_scored:,} applications in {elapsed:.2f}s "
+                    f"({rows_scored / max(elapsed, 1e-9):,.0f} rows/s) - {rows_flagged:,} flagged as high risk"
+                )
+                scored_file.seek(0)
+                st.download_button(
+                    label="💾 Download Scored CSV",
+                    data=scored_file,
+                    file_name=f"fraud_scored_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+
+    # Feature drift against the training distribution
+    if drift_monitor is not None:
+        with st.expander("📡 Feature Drift Monitor", expanded=False):
+            st.markdown(
+                "Scored applications are compared with the training data. PSI below 0.1 is stable, "
+                "0.1-0.25 a moderate shift and above 0.25 a significant one; KS is the largest gap "
+                "between the two cumulative distributions."
+            )
+            if st.button("🔄 Reset drift window"):
+                drift_monitor.reset()
+            if drift_monitor.rows == 0:
+                st.info("No applications scored yet.")
+            else:
+                st.caption(f"{drift_monitor.rows:,} applications since the last reset")
+                st.dataframe(
+                    [{"Column": row["column"], "PSI": round(row["psi"], 4), "KS": round(row["ks"], 4),
+                      "Status": row["status"]} for row in drift_monitor.report()],
+                    hide_index=True, width="stretch"
+                )
 
 # Footer
 st.markdown("""
@@ -0,0 +1,246 @@
+"""Reproducible training pipeline for the fraud model (scripted model_training.ipynb).
+
+Same split, scaler and forest as the notebook, but the forest is fitted on all
+cores and every stage is timed (and, with ``--profile-memory``, its Python-heap
+peak traced, which slows training down). Each run writes a versioned
+artifact directory with a ``model_metadata.json`` (feature order, data hash,
+metrics, timings and artifact hashes) plus the drift reference used by
+``drift_monitor`` and, unless ``--no-publish`` is given,
+installs the pair as the live ``fraud_detection_model.pkl``/``scaler.pkl``,
+which running apps pick up through the model registry.
+
+    python train_model.py                       # train on loan_land_fraud.csv and publish
+    python train_model.py --data nightly.csv --keep 14
+    python train_model.py --no-publish --profile-memory
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import (accuracy_score, confusion_matrix, f1_score, precision_score,
+                             recall_score, roc_auc_score)
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from drift_monitor import DRIFT_REFERENCE, DriftReference, reference_path_for
+from fraud_dataset import DATA_PATH, as_float64, load_dataset
+from fraud_scorer import FEATURES
+from model_registry import METADATA_FILE, MODEL_PATH, SCALER_PATH, file_sha256, metadata_path_for
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ARTIFACTS_DIR = "artifacts"
+TARGET = "isFraud"
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+class _Stage:
+    """Times one pipeline stage and, while tracemalloc is on, the Python-heap peak reached in it."""
+
+    def __init__(self, report, name):
+        self.report = report
+        self.name = name
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.report[self.name] = {"seconds": round(time.perf_counter() - self.started, 4)}
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            self.report[self.name]["peak_traced_mb"] = round(peak / (1 << 20), 2)
+        return False
+
+
+def evaluate(model, X_test_s, y_test):
+    fraud_index = list(model.classes_).index(1)
+    proba = model.predict_proba(X_test_s)
+    probabilities = proba[:, fraud_index]
+    y_pred = model.classes_[proba.argmax(axis=1)]
+    metrics = {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, zero_division=0),
+        "recall": recall_score(y_test, y_pred, zero_division=0),
+        "f1": f1_score(y_test, y_pred, zero_division=0),
+        "roc_auc": roc_auc_score(y_test, probabilities),
+        "confusion_matrix": confusion_matrix(y_test, y_pred).tolist(),
+    }
+    return metrics, probabilities
+
+
+def train(data_path=DATA_PATH, n_estimators=200, random_state=42, jobs=-1, profile_memory=False):
+    """Fit scaler and forest the way the notebook does; returns (model, scaler, drift reference, report)."""
+    if profile_memory:
+        tracemalloc.start()
+    stages = {}
+    started = time.perf_counter()
+    try:
+        with _Stage(stages, "load"):
+            df = load_dataset(data_path, columns=FEATURES + [TARGET])
+            # Fit on the exact CSV values, as the notebook does
+            X, y = as_float64(df[FEATURES]), df[TARGET].astype(np.int64)
+        with _Stage(stages, "split_scale"):
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.25, random_state=random_state, stratify=y)
+            scaler = StandardScaler()
+            X_train_s = scaler.fit_transform(X_train)
+            X_test_s = scaler.transform(X_test)
+        with _Stage(stages, "fit"):
+            model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=jobs)
+            model.fit(X_train_s, y_train)
+        # Trees do not depend on n_jobs; serve single-threaded like the notebook's
+        # model so one-row predictions do not pay for a thread pool.
+        model.set_params(n_jobs=None)
+        with _Stage(stages, "evaluate"):
+            metrics, test_probabilities = evaluate(model, X_test_s, y_test)
+        with _Stage(stages, "drift_reference"):
+            # Training features, and scores on held-out rows (the forest's
+            # scores on its own training rows are overconfident)
+            reference = DriftReference.from_data(X_train.to_numpy(), test_probabilities)
+    finally:
+        if profile_memory:
+            tracemalloc.stop()
+
+    report = {
+        "features": list(FEATURES),
+        "target": TARGET,
+        "data": {
+            "path": os.path.abspath(data_path),
+            "sha256": file_sha256(data_path),
+            "rows": len(df),
+            "train_rows": len(X_train),
+            "test_rows": len(X_test),
+            "fraud_rate": float(np.mean(y)),
+        },
+        "params": {"n_estimators": n_estimators, "random_state": random_state,
+                   "test_size": 0.25, "stratify": True, "fit_jobs": jobs},
+        "metrics": metrics,
+        "timings": {"total_seconds": round(time.perf_counter() - started, 4), "stages": stages},
+        "peak_rss_mb": peak_rss_mb(),
+        "environment": {"python": platform.python_version(), "sklearn": sklearn.__version__,
+                        "numpy": np.__version__, "cpus": os.cpu_count()},
+    }
+    return model, scaler, reference, report
+
+
+def _atomic_copy(src, dst):
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def write_artifacts(model, scaler, report, artifacts_dir=ARTIFACTS_DIR, reference=None):
+    """Write model, scaler, drift reference and metadata into a new versioned directory; returns its path."""
+    created = datetime.now(timezone.utc)
+    version = f"{created:%Y%m%dT%H%M%SZ}-{report['data']['sha256'][:8]}"
+    version_dir = os.path.join(artifacts_dir, version)
+    tmp_dir = f"{version_dir}.tmp"
+    os.makedirs(tmp_dir)
+    model_path = os.path.join(tmp_dir, os.path.basename(MODEL_PATH))
+    scaler_path = os.path.join(tmp_dir, os.path.basename(SCALER_PATH))
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, scaler_path)
+    if reference is not None:
+        reference.save(os.path.join(tmp_dir, DRIFT_REFERENCE))
+    metadata = {
+        "version": version,
+        "created_at": created.isoformat(),
+        **report,
+        "artifacts": {
+            "model": {"file": os.path.basename(model_path), "sha256": file_sha256(model_path),
+                      "bytes": os.path.getsize(model_path)},
+            "scaler": {"file": os.path.basename(scaler_path), "sha256": file_sha256(scaler_path),
+                       "bytes": os.path.getsize(scaler_path)},
+        },
+    }
+    with open(os.path.join(tmp_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_dir, version_dir)
+    return version_dir
+
+
+def publish(version_dir, model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """Install a versioned artifact set as the live model/scaler pair.
+
+    Each file is replaced atomically: the metadata first, then the scaler and
+    drift reference, the model last. From the first copy on, a half-installed
+    pair fails the new metadata's hash check, so the registry keeps serving the
+    previous version; this holds on the first publish too, when no metadata
+    was there to guard the old pair.
+    """
+    _atomic_copy(os.path.join(version_dir, METADATA_FILE), metadata_path_for(model_path))
+    _atomic_copy(os.path.join(version_dir, os.path.basename(SCALER_PATH)), scaler_path)
+    if os.path.exists(os.path.join(version_dir, DRIFT_REFERENCE)):
+        _atomic_copy(os.path.join(version_dir, DRIFT_REFERENCE), reference_path_for(model_path))
+    _atomic_copy(os.path.join(version_dir, os.path.basename(MODEL_PATH)), model_path)
+
+
+def prune(artifacts_dir, keep):
+    """Delete all but the ``keep`` newest version directories."""
+    versions = sorted(name for name in os.listdir(artifacts_dir)
+                      if os.path.isdir(os.path.join(artifacts_dir, name)) and not name.endswith(".tmp"))
+    for name in versions[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(artifacts_dir, name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the fraud model and write versioned artifacts.")
+    parser.add_argument("--data", default=DATA_PATH, help=f"training CSV (default: {DATA_PATH})")
+    parser.add_argument("--artifacts-dir", default=ARTIFACTS_DIR, help="where versioned artifacts are kept")
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument("--jobs", type=int, default=-1, help="cores used to fit the forest (-1 = all)")
+    parser.add_argument("--keep", type=int, default=10, help="versions to keep (0 = keep all)")
+    parser.add_argument("--no-publish", action="store_true", help="do not replace the live model/scaler")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="trace the Python-heap peak of each stage (slows training)")
+    args = parser.parse_args(argv)
+
+    print(f"🏋️ Training on {args.data} with {args.n_estimators} trees (jobs={args.jobs})...")
+    model, scaler, reference, report = train(args.data, args.n_estimators, args.random_state, args.jobs,
+                                             args.profile_memory)
+    version_dir = write_artifacts(model, scaler, report, args.artifacts_dir, reference=reference)
+    metrics, timings = report["metrics"], report["timings"]
+    print(f"✅ Accuracy {metrics['accuracy']:.4f}  F1 {metrics['f1']:.4f}  ROC-AUC {metrics['roc_auc']:.4f}")
+    for name, stage in timings["stages"].items():
+        heap = f"   peak heap {stage['peak_traced_mb']:8.1f} MB" if "peak_traced_mb" in stage else ""
+        print(f"   {name:<12} {stage['seconds']:8.3f} s{heap}")
+    rss = report["peak_rss_mb"]
+    print(f"⏱️ Total {timings['total_seconds']:.2f} s"
+          + (f", peak RSS {rss:.1f} MB" if rss is not None else ""))
+    print(f"📁 Artifacts written to {version_dir}")
+    if not args.no_publish:
+        publish(version_dir)
+        print(f"🚀 Published as {MODEL_PATH} / {SCALER_PATH}")
+    if args.keep:
+        prune(args.artifacts_dir, args.keep)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())